@@ -0,0 +1,282 @@
+"""
+Dzinēju salīdzinājums uz fiksēta pozīciju korpusa.
+
+Korpuss: virknes garumā 15..20 no seed, katrai - sākuma, vidus un beigu
+pozīcijas (pēc nejaušiem gājieniem). Katram dzinējam ar vienādu dziļumu mēra
+apmeklētos mezglus, mezglus sekundē, gājiena laika p50/p99 un maksimālo
+atmiņu (tracemalloc, atsevišķā piegājienā, jo tas palēnina izpildi).
+
+Visi dzinēji meklē ar to pašu dziļumu, tāpēc to izvēlēto gājienu vērtībām
+jāsakrīt; vērtību pārbauda ar pilnu Minimax bez nogriešanas. Nesakritības
+tiek iekļautas rezultātā, un programma beidzas ar kodu 1.
+
+Jaunu dzinēju pievieno vārdnīcā ENGINES.
+
+Ar --startup mēra moduļu importēšanas laiku (katru jaunā procesā) un
+pārbauda, ka imports neatver pygame logu.
+
+Palaišana: python Benchmark.py [--depth N] [--seed S] [--engines minimax alphabeta]
+           [--output results.json]
+           python Benchmark.py --startup [--repeats N]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import AlfaBeta
+import MiniMax
+from Engine import PRUNING_ALPHABETA, PRUNING_NONE, PRUNING_PVS, Search
+from GameState import make_state, apply_sequence_move
+from Main_without_GUI import generate_sequence
+from SearchStats import SearchStats
+from TranspositionTable import TranspositionTable
+
+LENGTHS = range(15, 21)
+PHASES = ("early", "mid", "end")
+# Cik skaitļu virknē paliek beigu pozīcijās
+ENDGAME_NUMBERS = 6
+
+
+def make_position(seed, length, phase, index):
+    """
+    Viena korpusa pozīcija; atkarīga tikai no argumentiem.
+    """
+    rng = random.Random(f"{seed}:{length}:{phase}:{index}")
+    sequence = generate_sequence(length, rng)
+    ai_score = human_score = 0
+    ai_turn = rng.random() < 0.5
+
+    # Sākumā 0..2 gājieni, vidū - līdz pusei virknes, beigās - līdz ENDGAME_NUMBERS skaitļiem
+    plies = rng.randint(0, 2) if phase == "early" else None
+    target = length // 2 if phase == "mid" else ENDGAME_NUMBERS
+
+    while sequence:
+        if plies is not None:
+            if plies == 0:
+                break
+            plies -= 1
+        elif len(sequence) <= target:
+            break
+        move = rng.choice(make_state(sequence, ai_score, human_score, ai_turn).moves())
+        sequence, ai_score, human_score = apply_sequence_move(
+            sequence, ai_score, human_score, move, ai_turn)
+        ai_turn = not ai_turn
+
+    return {
+        "id": f"{length}-{phase}-{index}",
+        "length": length,
+        "phase": phase,
+        "sequence": sequence,
+        "ai_score": ai_score,
+        "human_score": human_score,
+        "ai_turn": ai_turn,
+    }
+
+
+def build_corpus(seed=0, per_phase=2):
+    return [make_position(seed, length, phase, index)
+            for length in LENGTHS
+            for phase in PHASES
+            for index in range(per_phase)]
+
+
+# --- Dzinēji: (position, depth, stats) -> kanonisks gājiens ---
+def _minimax(position, depth, stats):
+    return MiniMax.find_best_move(position["sequence"], position["ai_score"],
+                                  position["human_score"], exact=False,
+                                  ai_turn=position["ai_turn"], depth=depth, stats=stats)
+
+
+def _alphabeta(pruning):
+    def run(position, depth, stats):
+        # Katrai pozīcijai jauna tabula, lai rezultāts nebūtu atkarīgs no secības
+        return AlfaBeta.find_best_move(position["sequence"], position["ai_score"],
+                                       position["human_score"], position["ai_turn"],
+                                       tt=TranspositionTable(), time_budget=None,
+                                       stats=stats, pruning=pruning, tablebase=None,
+                                       depth=depth, book=None)
+    return run
+
+
+ENGINES = {
+    "minimax": _minimax,
+    "alphabeta": _alphabeta(PRUNING_ALPHABETA),
+    "pvs": _alphabeta(PRUNING_PVS),
+}
+
+
+def move_value(position, move, depth):
+    """
+    Gājiena vērtība gājiena izdarītājam pēc pilna Minimax ar dziļumu 'depth'.
+    """
+    state = make_state(position["sequence"], position["ai_score"],
+                       position["human_score"], position["ai_turn"])
+    state.make(move)
+    return -Search(PRUNING_NONE).negamax(state, depth - 1)
+
+
+def percentile(values, p):
+    """
+    p-tā procentile (nearest-rank).
+    """
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * p // 100))
+    return ordered[rank - 1]
+
+
+def run_engine(name, corpus, depth):
+    """
+    Atgriež (mērījumi, izvēlētie gājieni).
+    """
+    engine = ENGINES[name]
+    latencies = []
+    moves = []
+    nodes = 0
+    for position in corpus:
+        stats = SearchStats()
+        start = time.perf_counter()
+        moves.append(engine(position, depth, stats))
+        latencies.append(time.perf_counter() - start)
+        nodes += stats.total_nodes
+
+    tracemalloc.start()
+    for position in corpus:
+        engine(position, depth, SearchStats())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    total = sum(latencies)
+    return {
+        "positions": len(corpus),
+        "total_nodes": nodes,
+        "total_time": total,
+        "nodes_per_sec": nodes / total if total > 0 else 0.0,
+        "mean_ms": 1000 * total / len(corpus),
+        "p50_ms": 1000 * percentile(latencies, 50),
+        "p99_ms": 1000 * percentile(latencies, 99),
+        "peak_memory_bytes": peak,
+    }, moves
+
+
+def run_benchmark(engines, depth=4, seed=0, per_phase=2):
+    corpus = [position for position in build_corpus(seed, per_phase) if position["sequence"]]
+    results = {}
+    chosen = {}
+    for name in engines:
+        results[name], chosen[name] = run_engine(name, corpus, depth)
+
+    mismatches = []
+    for i, position in enumerate(corpus):
+        values = {name: move_value(position, chosen[name][i], depth) for name in engines}
+        if len(set(values.values())) > 1:
+            mismatches.append({
+                "position": position["id"],
+                "moves": {name: list(chosen[name][i]) for name in engines},
+                "values": values,
+            })
+
+    baseline = results[engines[0]]["total_nodes"]
+    for name in engines:
+        results[name]["node_ratio"] = results[name]["total_nodes"] / baseline if baseline else 0.0
+
+    return {
+        "depth": depth,
+        "seed": seed,
+        "positions": len(corpus),
+        "python": platform.python_version(),
+        "baseline": engines[0],
+        "engines": results,
+        "value_mismatches": mismatches,
+    }
+
+
+# Moduļi, kuru importēšanas laiku mēra startup_benchmark()
+STARTUP_MODULES = ("Engine", "Tablebase", "MiniMax", "AlfaBeta", "Main_without_GUI", "Main")
+
+_STARTUP_PROBE = """
+import sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+pygame = sys.modules.get("pygame")
+print(elapsed, int(pygame is not None), int(bool(pygame and pygame.display.get_init())))
+"""
+
+
+def startup_benchmark(modules=STARTUP_MODULES, repeats=5):
+    """
+    Katru moduli importē jaunā Python procesā un mēra importēšanas laiku.
+    Atzīmē arī, vai imports ielādēja pygame un vai tas inicializēja displeju.
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+    results = {}
+    for module in modules:
+        times = []
+        for _ in range(repeats):
+            proc = subprocess.run([sys.executable, "-c", _STARTUP_PROBE.format(module=module)],
+                                  cwd=here, env=env, capture_output=True, text=True)
+            if proc.returncode != 0:
+                lines = proc.stderr.strip().splitlines()
+                results[module] = {"error": lines[-1] if lines else f"exit {proc.returncode}"}
+                break
+            elapsed, imports_pygame, opens_display = proc.stdout.split()[-3:]
+            times.append(float(elapsed))
+        else:
+            results[module] = {
+                "median_ms": 1000 * statistics.median(times),
+                "min_ms": 1000 * min(times),
+                "imports_pygame": imports_pygame == "1",
+                "opens_display": opens_display == "1",
+            }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the search engines on a seeded corpus.")
+    parser.add_argument("--depth", type=int, default=4, help="search depth for every engine")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--per-phase", type=int, default=2,
+                        help="positions per (length, phase) pair")
+    parser.add_argument("--engines", nargs="+", choices=sorted(ENGINES),
+                        default=list(ENGINES), help="engines to run; the first is the baseline")
+    parser.add_argument("--output", default=None, help="write JSON here instead of stdout")
+    parser.add_argument("--startup", action="store_true",
+                        help="measure module import times instead of search performance")
+    parser.add_argument("--repeats", type=int, default=5, help="imports per module for --startup")
+    args = parser.parse_args()
+
+    if args.startup:
+        report = {
+            "python": platform.python_version(),
+            "repeats": args.repeats,
+            "startup": startup_benchmark(repeats=args.repeats),
+        }
+    else:
+        report = run_benchmark(args.engines, args.depth, args.seed, args.per_phase)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.startup:
+        if any(result.get("opens_display") for result in report["startup"].values()):
+            print("importing a module opened the pygame display", file=sys.stderr)
+            sys.exit(1)
+    elif report["value_mismatches"]:
+        print(f"{len(report['value_mismatches'])} positions where engines disagree on move value",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+"""
+Vienots meklēšanas dzinējs Minimax un Alpha-Beta algoritmiem.
+
+Kodols ir negamax: vērtība vienmēr tiek rēķināta no tā spēlētāja viedokļa,
+kuram ir gājiens (viņa punkti - pretinieka punkti), un pretinieka vērtība
+ir tās pašas vērtības mīnuss. Tāpēc AI un cilvēka gājieniem nav vajadzīgi
+atsevišķi max/min zari.
+
+Nogriešanas veidu izvēlas ar 'pruning':
+- "none":      pilns Minimax bez nogriešanas;
+- "alphabeta": Alpha-Beta ar transpozīciju tabulu un gājienu kārtošanu;
+- "pvs":       Principal Variation Search - tas pats Alpha-Beta, bet visus
+               gājienus pēc pirmā vispirms pārbauda ar nulles logu
+               (alpha, alpha + 1) un pilnā logā pārmeklē tikai tad, ja
+               gājiens izrādās labāks. Novērtējums ir vesels skaitlis
+               (punktu starpība), tāpēc nulles logs nogriež ļoti daudz.
+
+Iteratīvajā padziļināšanā var izmantot aspirācijas logu: nākamo iterāciju
+sāk ar logu ap iepriekšējās iterācijas vērtību un paplašina to tikai tad,
+ja rezultāts izkrīt ārpus loga.
+
+Gājieni visur ir kanoniskā formā (action, value), piem. ("take", 3),
+("split2", 2), ("split4", 4). Virknē tos pielieto GameState.apply_sequence_move().
+"""
+
+import time
+
+from MoveOrdering import MoveOrdering
+from TranspositionTable import EXACT, LOWER, UPPER, DEPTH, BEST_MOVE
+
+INF = float('inf')
+
+PRUNING_NONE = "none"
+PRUNING_ALPHABETA = "alphabeta"
+PRUNING_PVS = "pvs"
+PRUNING_MODES = (PRUNING_NONE, PRUNING_ALPHABETA, PRUNING_PVS)
+
+# Precīzā atrisinājuma kešs: canonical_key -> (punktu pieaugums gājiena izdarītājam, gājiens).
+# Saglabājas starp gājieniem un spēlēm; atslēgu skaitu ierobežo kanonisko stāvokļu skaits.
+SOLVE_CACHE = {}
+
+
+class SearchTimeout(Exception):
+    """
+    Meklēšanai beidzies laika budžets.
+    """
+
+
+def side_sign(state):
+    """
+    +1, ja gājiens ir AI, -1, ja cilvēkam.
+    """
+    return 1 if state.ai_turn else -1
+
+
+class Search:
+    """
+    Viena meklēšana ar izvēlēto nogriešanas veidu.
+
+    tt       - TranspositionTable vai None;
+    ordering - MoveOrdering vai None (gājienus izmeklē ģenerēšanas secībā);
+    stats    - SearchStats vai None;
+    deadline - time.perf_counter() vērtība, pēc kuras meklēšanu pārtrauc ar SearchTimeout;
+    aspiration - aspirācijas loga pusplatums iteratīvajai padziļināšanai vai None;
+    cancel   - threading.Event vai None; kad tas iestatīts, meklēšanu pārtrauc ar SearchTimeout.
+
+    Gājienus pielieto uz vietas (state.make/unmake), tāpēc pēc meklēšanas
+    stāvoklis ir tāds pats kā pirms tās (arī pēc SearchTimeout).
+    """
+
+    def __init__(self, pruning=PRUNING_ALPHABETA, tt=None, ordering=None,
+                 stats=None, deadline=None, aspiration=None, cancel=None):
+        if pruning not in PRUNING_MODES:
+            raise ValueError(f"Unknown pruning mode: {pruning!r}")
+        self.pruning = pruning
+        self.tt = tt
+        self.ordering = ordering
+        self.stats = stats
+        self.deadline = deadline
+        self.aspiration = aspiration
+        self.cancel = cancel
+        # Pēdējais pilnībā pabeigtais iteratīvās padziļināšanas dziļums
+        self.completed_depth = 0
+
+    def negamax(self, state, depth, alpha=-INF, beta=INF, ply=1):
+        """
+        Atgriež stāvokļa vērtību no gājiena izdarītāja viedokļa.
+        """
+        stats = self.stats
+        if stats is not None:
+            stats.record_node(ply)
+
+        if depth == 0 or state.is_terminal():
+            return side_sign(state) * state.evaluate()
+
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchTimeout
+        if self.cancel is not None and self.cancel.is_set():
+            raise SearchTimeout
+
+        pruning = self.pruning != PRUNING_NONE
+        tt = self.tt if pruning else None
+        alpha_orig, beta_orig = alpha, beta
+        tt_move = None
+        if tt is not None:
+            key = state.key()
+            entry = tt.lookup(key)
+            if stats is not None:
+                stats.tt_probes += 1
+                stats.tt_hits += entry is not None
+            if entry is not None:
+                # Arī seklāks ieraksts zina labu gājienu, ko izmēģināt pirmo
+                tt_move = entry[BEST_MOVE]
+                if entry[DEPTH] >= depth:
+                    tt_value, flag = entry[0], entry[2]
+                    if flag == EXACT:
+                        return tt_value
+                    elif flag == LOWER:
+                        alpha = max(alpha, tt_value)
+                    else:
+                        beta = min(beta, tt_value)
+                    if alpha >= beta:
+                        return tt_value
+
+        moves = state.moves()
+        if self.ordering is not None:
+            moves = self.ordering.order(moves, ply, tt_move)
+
+        value = -INF
+        best_move = None
+        for i, move in enumerate(moves):
+            undo = state.make(move)
+            try:
+                score = self.search_child(state, depth - 1, alpha, beta, i == 0, ply + 1)
+            finally:
+                state.unmake(move, undo)
+
+            if score > value:
+                value = score
+                best_move = move
+            if pruning:
+                if value > alpha:
+                    alpha = value
+                if alpha >= beta:
+                    self.record_cutoff(move, ply, depth)
+                    break
+
+        if tt is not None:
+            # Vērtības tips atkarīgs no sākotnējā loga
+            if value <= alpha_orig:
+                flag = UPPER
+            elif value >= beta_orig:
+                flag = LOWER
+            else:
+                flag = EXACT
+            tt.store(key, value, depth, flag, best_move)
+        return value
+
+    def search_child(self, state, depth, alpha, beta, first, ply):
+        """
+        Novērtē bērna stāvokli (gājiens jau izdarīts) no vecāka viedokļa.
+        PVS režīmā visus gājienus, izņemot pirmo, vispirms pārbauda ar nulles logu.
+        """
+        if self.pruning == PRUNING_PVS and not first:
+            score = -self.negamax(state, depth, -alpha - 1, -alpha, ply)
+            if alpha < score < beta:
+                # Gājiens ir labāks par līdzšinējo labāko - vajag precīzu vērtību
+                score = -self.negamax(state, depth, -beta, -alpha, ply)
+            return score
+        return -self.negamax(state, depth, -beta, -alpha, ply)
+
+    def record_cutoff(self, move, ply, depth):
+        if self.ordering is not None:
+            self.ordering.record_cutoff(move, ply, depth)
+        if self.stats is not None:
+            self.stats.record_cutoff(ply)
+
+    def search_root(self, state, depth, first_move=None, alpha=-INF, beta=INF):
+        """
+        Izmeklē visus saknes gājienus ar dziļumu 'depth'; 'first_move'
+        (piem., iepriekšējās iterācijas labāko gājienu) izmeklē pirmo.
+        (alpha, beta) ir saknes logs; ja vērtība izkrīt ārpus tā, tā ir tikai robeža.
+        Atgriež (best_move, best_value) no gājiena izdarītāja viedokļa.
+        """
+        if self.stats is not None:
+            self.stats.record_node(0)
+        moves = state.moves()
+        if self.ordering is not None:
+            moves = self.ordering.order(moves, 0, first_move)
+
+        pruning = self.pruning != PRUNING_NONE
+        best_move = None
+        best_value = -INF
+        for i, move in enumerate(moves):
+            undo = state.make(move)
+            try:
+                if pruning:
+                    # Gājienam jābūt labākam par jau atrasto, tāpēc alpha aug līdz best_value
+                    score = self.search_child(state, depth - 1, alpha, beta, i == 0, 1)
+                else:
+                    score = -self.negamax(state, depth - 1)
+            finally:
+                state.unmake(move, undo)
+            if best_move is None or score > best_value:
+                best_value = score
+                best_move = move
+            if pruning:
+                if best_value > alpha:
+                    alpha = best_value
+                if alpha >= beta:
+                    break
+
+        return best_move, best_value
+
+    def iterative_deepening(self, state, time_budget):
+        """
+        Meklē ar dziļumu 1, 2, 3 ... kamēr nav beidzies laika budžets (sekundēs).
+        Atgriež pēdējās pilnībā pabeigtās iterācijas labāko gājienu.
+        """
+        deadline = time.perf_counter() + time_budget
+        best_move = None
+        best_value = None
+
+        # Dziļāk par max_plies() vairs nav ko meklēt
+        for depth in range(1, state.max_plies() + 1):
+            # Pirmo iterāciju pabeidzam vienmēr, lai būtu ko atgriezt
+            self.deadline = deadline if depth > 1 else None
+            try:
+                best_move, best_value = self.search_iteration(state, depth, best_move, best_value)
+            except SearchTimeout:
+                break
+            finally:
+                self.deadline = None
+            self.completed_depth = depth
+            if time.perf_counter() >= deadline:
+                break
+
+        return best_move
+
+    def search_iteration(self, state, depth, prev_move, prev_value):
+        """
+        Viena iteratīvās padziļināšanas iterācija. Ar aspirācijas logu sāk ar
+        (prev_value - aspiration, prev_value + aspiration); ja rezultāts izkrīt
+        ārpus loga, attiecīgo robežu atver līdz bezgalībai un meklē vēlreiz.
+        """
+        if (self.aspiration is None or prev_value is None
+                or self.pruning == PRUNING_NONE):
+            return self.search_root(state, depth, prev_move)
+
+        alpha = prev_value - self.aspiration
+        beta = prev_value + self.aspiration
+        while True:
+            move, value = self.search_root(state, depth, prev_move, alpha, beta)
+            if value <= alpha:
+                alpha = -INF
+            elif value >= beta:
+                beta = INF
+            else:
+                return move, value
+            prev_move = move
+
+
+def best_move(state, pruning=PRUNING_ALPHABETA, depth=3, time_budget=None,
+              tt=None, stats=None, aspiration=None, cancel=None):
+    """
+    Atrod labāko gājienu stāvoklim 'state' tam spēlētājam, kuram ir gājiens.
+    Ar time_budget (sekundēs) izmanto iteratīvo padziļināšanu, citādi fiksētu 'depth'.
+    'aspiration' (loga pusplatums) darbojas tikai iteratīvajā padziļināšanā.
+    Atgriež kanonisku gājienu vai None, ja gājienu nav.
+    Ja 'cancel' (threading.Event) tiek iestatīts, fiksēta dziļuma meklēšana beidzas
+    ar SearchTimeout, bet iteratīvā - ar pēdējās pabeigtās iterācijas gājienu.
+    """
+    if state.is_terminal():
+        return None
+
+    # Killer/history tabulas katram gājienam sākam no jauna
+    ordering = MoveOrdering() if pruning != PRUNING_NONE else None
+    search = Search(pruning, tt, ordering, stats, aspiration=aspiration, cancel=cancel)
+    if time_budget is not None:
+        move = search.iterative_deepening(state, time_budget)
+        depth = search.completed_depth
+    else:
+        move, _ = search.search_root(state, depth)
+    if stats is not None:
+        stats.source = pruning
+        stats.depth = depth
+    return move
+
+
+def solve(state, cache=SOLVE_CACHE, stats=None, ply=0, cancel=None):
+    """
+    Precīzs Minimax līdz spēles beigām ar memoizāciju.
+    Atgriež (gain, move): cik gājiena izdarītāja punktu pārsvars vēl pieaugs
+    līdz spēles beigām pie optimālas spēles abām pusēm, un labāko gājienu.
+    Galīgā (ai_score - human_score) vērtība ir solve_value(state).
+    'stats' skaita tikai no jauna atrisinātos stāvokļus (keša trāpījumi - kā tt_hits).
+    Ja 'cancel' (threading.Event) tiek iestatīts, beidz ar SearchTimeout; jau
+    atrisinātie stāvokļi paliek kešā.
+    """
+    if state.is_terminal():
+        return 0, None
+
+    key = state.canonical_key()
+    cached = cache.get(key)
+    if stats is not None:
+        stats.tt_probes += 1
+        stats.tt_hits += cached is not None
+    if cached is not None:
+        return cached
+    if cancel is not None and cancel.is_set():
+        raise SearchTimeout
+    if stats is not None:
+        stats.record_node(ply)
+
+    sign = side_sign(state)
+    lead = sign * state.evaluate()
+    best_gain = -INF
+    best = None
+    for move in state.moves():
+        undo = state.make(move)
+        # Pēc make() gājiens ir pretiniekam, tāpēc zīme ir pretēja
+        try:
+            gain = sign * state.evaluate() - lead - solve(state, cache, stats, ply + 1, cancel)[0]
+        finally:
+            state.unmake(move, undo)
+        if gain > best_gain:
+            best_gain = gain
+            best = move
+
+    cache[key] = (best_gain, best)
+    return best_gain, best
+
+
+def solve_value(state, cache=SOLVE_CACHE):
+    """
+    Spēles teorētiskā galīgā vērtība (ai_score - human_score).
+    """
+    gain, _ = solve(state, cache)
+    return state.evaluate() + side_sign(state) * gain
@@ -0,0 +1,193 @@
+"""
+Spēļu ieraksti: katra spēle kā notikumu virkne JSON rindās (JSON Lines).
+
+Notikumi (katrā ir "game" - spēles id - un "event"):
+- start: {"sequence": [...], "player": vārds, "algo": algoritms, "level": n,
+          "first": "player"/"computer", "time": sākuma laiks (ISO)}
+- move:  {"side": "player"/"ai", "move": [action, value], "index": pozīcija virknē,
+          "scores": [player_score, ai_score] pēc gājiena, "ms": AI domāšanas laiks}
+- end:   {"scores": [player_score, ai_score], "result": "player"/"ai"/"draw"}
+
+Rindas tiek rakstītas uzreiz, spēlei notiekot, tāpēc pārtraukta spēle
+paliek failā bez "end". Vairāku spēļu (arī no vairākiem procesiem) notikumi
+var mīties - lasītājs tos grupē pēc "game".
+
+read_games() lasa failu plūsmā: atmiņā ir tikai tās spēles, kas vēl nav
+beigušās, tāpēc var apstrādāt miljoniem ierakstu.
+
+Pārbaude / kopsavilkums: python GameRecord.py [PATH ...]
+"""
+
+import argparse
+import json
+import os
+import sys
+import uuid
+from datetime import datetime
+
+from GameState import apply_sequence_move
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "games.jsonl")
+
+
+def find_move(before, after):
+    """
+    Atrod gājienu, kas virkni 'before' pārvērta par 'after'.
+    Atgriež (move, index); ja vairākas pozīcijas dod to pašu virkni, index ir pirmā no tām.
+    """
+    index = 0
+    while index < len(after) and index < len(before) and before[index] == after[index]:
+        index += 1
+    value = before[index]
+    if len(after) == len(before) - 1:
+        return ("take", value), index
+    return (("split2", 2) if value == 2 else ("split4", 4)), index
+
+
+class GameRecorder:
+    """
+    Raksta notikumus failā 'path' (papildina to). Katra rinda uzreiz nonāk
+    failā (rindu buferis), tāpēc ieraksts nepazūd, ja programma tiek pārtraukta.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.file = open(path, "a", encoding="utf-8", buffering=1)
+        self.game = None
+
+    def _write(self, event, **fields):
+        record = {"game": self.game, "event": event}
+        record.update(fields)
+        self.file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def start_game(self, sequence, player=None, algo=None, level=1, first="player"):
+        self.game = uuid.uuid4().hex[:12]
+        self._write("start", sequence=list(sequence), player=player, algo=algo,
+                    level=level, first=first,
+                    time=datetime.now().isoformat(timespec="seconds"))
+
+    def record_move(self, side, move, index, player_score, ai_score, ms=None):
+        if self.game is None:
+            return
+        fields = {"side": side, "move": list(move), "index": index,
+                  "scores": [player_score, ai_score]}
+        if ms is not None:
+            fields["ms"] = round(ms, 3)
+        self._write("move", **fields)
+
+    def end_game(self, player_score, ai_score, result):
+        if self.game is None:
+            return
+        self._write("end", scores=[player_score, ai_score], result=result)
+        self.game = None
+
+    def close(self):
+        self.file.close()
+
+
+def open_default(path=DEFAULT_PATH):
+    """
+    Atver ierakstu failu vai atgriež None, ja to nevar (spēle tad netiek ierakstīta).
+    """
+    try:
+        return GameRecorder(path)
+    except OSError as e:
+        print(f"Games are not recorded: {e}", file=sys.stderr)
+        return None
+
+
+def iter_events(path):
+    """
+    Notikumi no faila pa vienam. Bojātas rindas (piem., nepabeigtu pēdējo rindu) izlaiž.
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def read_games(path):
+    """
+    Spēles no faila pa vienai, tiklīdz nolasīts to "end" notikums:
+    start notikuma lauki + "moves" (move notikumu saraksts) + "scores" un "result".
+    Faila beigās atgriež arī nepabeigtās spēles (ar "result": None).
+    """
+    open_games = {}
+    for event in iter_events(path):
+        kind = event.get("event")
+        if kind == "start":
+            game = dict(event)
+            del game["event"]
+            game.update(moves=[], scores=[0, 0], result=None)
+            open_games[event["game"]] = game
+        elif kind == "move":
+            game = open_games.get(event["game"])
+            if game is not None:
+                game["moves"].append(event)
+                game["scores"] = event["scores"]
+        elif kind == "end":
+            game = open_games.pop(event["game"], None)
+            if game is not None:
+                game["scores"] = event["scores"]
+                game["result"] = event["result"]
+                yield game
+    yield from open_games.values()
+
+
+def replay(game):
+    """
+    Atkārto spēles gājienus. Pēc katra gājiena atgriež (move event, sequence,
+    player_score, ai_score); ValueError, ja ierakstītie punkti nesakrīt ar noteikumiem.
+    """
+    sequence = list(game["sequence"])
+    player_score = ai_score = 0
+    for event in game["moves"]:
+        ai_turn = event["side"] == "ai"
+        sequence, ai_score, player_score = apply_sequence_move(
+            sequence, ai_score, player_score, tuple(event["move"]), ai_turn, event["index"])
+        if [player_score, ai_score] != event["scores"]:
+            raise ValueError(f"game {game['game']}: recorded scores {event['scores']}, "
+                             f"replay gives {[player_score, ai_score]}")
+        yield event, sequence, player_score, ai_score
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay and summarize recorded games.")
+    parser.add_argument("paths", nargs="*", default=[DEFAULT_PATH], help="game record files")
+    args = parser.parse_args()
+
+    games = 0
+    results = {"player": 0, "ai": 0, "draw": 0, "unfinished": 0}
+    ai_moves = 0
+    ai_ms = 0.0
+    invalid = 0
+    for path in args.paths:
+        if not os.path.exists(path):
+            parser.error(f"no such file: {path}")
+        for game in read_games(path):
+            games += 1
+            result = game["result"] or "unfinished"
+            results[result] = results.get(result, 0) + 1
+            try:
+                for event, *_ in replay(game):
+                    if "ms" in event:
+                        ai_moves += 1
+                        ai_ms += event["ms"]
+            except (ValueError, IndexError) as e:
+                invalid += 1
+                print(e, file=sys.stderr)
+
+    print(json.dumps({
+        "games": games,
+        "results": results,
+        "ai_moves": ai_moves,
+        "avg_ai_ms": ai_ms / ai_moves if ai_moves else 0.0,
+        "invalid": invalid,
+    }, indent=2))
+    if invalid:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Kanoniskais spēles stāvoklis Minimax un Alpha-Beta meklēšanai.
+
+Spēles iznākums ir atkarīgs tikai no tā, cik virknē ir skaitļu 1, 2, 3 un 4,
+nevis no to pozīcijām. Tāpēc meklēšana strādā ar skaitļu skaitiem, punktiem
+un gājiena tiesībām, un katrā stāvoklī ir ne vairāk kā 6 atšķirīgi gājieni:
+take 1/2/3/4, split2 un split4.
+
+Meklēšana izmanto vienu GameState objektu: make() pielieto gājienu uz vietas,
+unmake() to atsauc, tāpēc katrā mezglā nav jākopē virkne.
+"""
+
+
+class GameState:
+    __slots__ = ("counts", "ai_score", "human_score", "ai_turn")
+
+    def __init__(self, counts, ai_score, human_score, ai_turn=True):
+        # counts[v] - cik reizes skaitlis v (1..4) ir virknē; counts[0] neizmanto
+        self.counts = counts
+        self.ai_score = ai_score
+        self.human_score = human_score
+        self.ai_turn = ai_turn
+
+    @classmethod
+    def from_sequence(cls, sequence, ai_score, human_score, ai_turn=True):
+        """
+        Pārveido virkni un punktus kanoniskajā stāvoklī.
+        """
+        counts = [0, 0, 0, 0, 0]
+        for value in sequence:
+            counts[value] += 1
+        return cls(counts, ai_score, human_score, ai_turn)
+
+    def copy(self):
+        return GameState(list(self.counts), self.ai_score, self.human_score, self.ai_turn)
+
+    def key(self):
+        """
+        Jaucama atslēga transpozīciju tabulai:
+        (c1, c2, c3, c4, ai_score, human_score, ai_turn).
+        """
+        counts = self.counts
+        return (counts[1], counts[2], counts[3], counts[4],
+                self.ai_score, self.human_score, self.ai_turn)
+
+    def canonical_key(self):
+        """
+        Stāvokļa atslēga no gājiena izdarītāja viedokļa: (c1, c2, c3, c4, mover, opponent).
+
+        Punkti ietekmē turpmāko spēli tikai caur max(0, score - 1) split4 gājienā.
+        Nākotnē notiks ne vairāk kā c4 split4 gājienu, tāpēc punktus, kas >= c4,
+        var aizstāt ar c4 - turpmākais punktu starpības pieaugums nemainās.
+        """
+        counts = self.counts
+        c4 = counts[4]
+        if self.ai_turn:
+            mover, opponent = self.ai_score, self.human_score
+        else:
+            mover, opponent = self.human_score, self.ai_score
+        return (counts[1], counts[2], counts[3], c4, min(mover, c4), min(opponent, c4))
+
+    def is_terminal(self):
+        """
+        Spēle ir beigusies, ja virknē vairs nav neviena skaitļa.
+        """
+        counts = self.counts
+        return not (counts[1] or counts[2] or counts[3] or counts[4])
+
+    def evaluate(self):
+        """
+        Stāvokļa novērtējums: (ai_score - human_score).
+        """
+        return self.ai_score - self.human_score
+
+    def max_plies(self):
+        """
+        Garākais iespējamais spēles turpinājums gājienos: 1 un 3 tiek paņemti ar
+        vienu gājienu, 2 var sadalīt un paņemt abus 1 (3 gājieni),
+        bet 4 -> split4 un divi šādi divnieki (7 gājieni).
+        Meklēšana ar šādu dziļumu jau sasniedz spēles beigas visos variantos.
+        """
+        counts = self.counts
+        return counts[1] + 3 * counts[2] + counts[3] + 7 * counts[4]
+
+    def moves(self):
+        """
+        Ģenerē visus atšķirīgos gājienus kā (action, value) pārus.
+        """
+        counts = self.counts
+        moves = []
+        for value in (1, 2, 3, 4):
+            if counts[value]:
+                moves.append(("take", value))
+        if counts[2]:
+            moves.append(("split2", 2))
+        if counts[4]:
+            moves.append(("split4", 4))
+        return moves
+
+    def make(self, move):
+        """
+        Pielieto gājienu uz vietas; gājiena tiesības pāriet pretiniekam.
+        Atgriež 'undo' vērtību, kas jānodod unmake(): cik punktu split4
+        tiešām atņēma pretiniekam (0, ja pretiniekam jau bija 0).
+        """
+        action, value = move
+        counts = self.counts
+        undo = 0
+
+        if action == "take":
+            counts[value] -= 1
+            if self.ai_turn:
+                self.ai_score += value
+            else:
+                self.human_score += value
+
+        elif action == "split2":
+            # 2 -> [1, 1], pretiniekam +1
+            counts[2] -= 1
+            counts[1] += 2
+            if self.ai_turn:
+                self.human_score += 1
+            else:
+                self.ai_score += 1
+
+        elif action == "split4":
+            # 4 -> [2, 2], pretiniekam -1 (ne zem 0)
+            counts[4] -= 1
+            counts[2] += 2
+            if self.ai_turn:
+                if self.human_score > 0:
+                    self.human_score -= 1
+                    undo = 1
+            else:
+                if self.ai_score > 0:
+                    self.ai_score -= 1
+                    undo = 1
+
+        self.ai_turn = not self.ai_turn
+        return undo
+
+    def unmake(self, move, undo):
+        """
+        Atsauc gājienu, kas pielietots ar make().
+        """
+        self.ai_turn = not self.ai_turn
+        action, value = move
+        counts = self.counts
+
+        if action == "take":
+            counts[value] += 1
+            if self.ai_turn:
+                self.ai_score -= value
+            else:
+                self.human_score -= value
+
+        elif action == "split2":
+            counts[2] += 1
+            counts[1] -= 2
+            if self.ai_turn:
+                self.human_score -= 1
+            else:
+                self.ai_score -= 1
+
+        elif action == "split4":
+            counts[4] += 1
+            counts[2] -= 2
+            if self.ai_turn:
+                self.human_score += undo
+            else:
+                self.ai_score += undo
+
+    def __repr__(self):
+        return (f"GameState(counts={self.counts[1:]}, ai_score={self.ai_score}, "
+                f"human_score={self.human_score}, ai_turn={self.ai_turn})")
+
+
+def make_state(sequence, ai_score, human_score, ai_turn=True):
+    """
+    Saīsinājums GameState.from_sequence().
+    """
+    return GameState.from_sequence(sequence, ai_score, human_score, ai_turn)
+
+
+def move_index(sequence, move):
+    """
+    Atrod virknē pozīciju, uz kuru attiecas kanoniskais gājiens.
+    """
+    return sequence.index(move[1])
+
+
+def apply_sequence_move(sequence, ai_score, human_score, move, ai_turn=True, index=None):
+    """
+    Pielieto kanonisko gājienu (action, value) īstajai virknei un punktiem.
+    Gājiens attiecas uz skaitli pozīcijā 'index' (piem., uz kura noklikšķināja)
+    vai, ja tā nav, uz pirmo skaitli 'value' virknē.
+    Atgriež (new_sequence, new_ai_score, new_human_score); 'sequence' netiek mainīts.
+    """
+    action, value = move
+    new_sequence = sequence[:]
+    if index is None:
+        index = move_index(new_sequence, move)
+    elif new_sequence[index] != value:
+        raise ValueError(f"Move {move} does not match sequence[{index}] = {new_sequence[index]}")
+
+    if action == "take":
+        new_sequence.pop(index)
+        if ai_turn:
+            ai_score += value
+        else:
+            human_score += value
+
+    elif action == "split2":
+        # 2 -> [1, 1], pretiniekam +1
+        new_sequence[index:index + 1] = [1, 1]
+        if ai_turn:
+            human_score += 1
+        else:
+            ai_score += 1
+
+    elif action == "split4":
+        # 4 -> [2, 2], pretiniekam -1 (ne zem 0)
+        new_sequence[index:index + 1] = [2, 2]
+        if ai_turn:
+            human_score = max(0, human_score - 1)
+        else:
+            ai_score = max(0, ai_score - 1)
+
+    return new_sequence, ai_score, human_score
@@ -0,0 +1,252 @@
+"""
+Monte Carlo koka meklēšana (MCTS ar UCT) kā trešais AI algoritms.
+
+Katrs izspēles cikls:
+1. izvēle - no saknes iet uz bērnu ar lielāko UCB1 vērtību
+   (uzvaru īpatsvars + EXPLORATION * sqrt(ln N / n)), kamēr mezglam ir
+   izmēģināti visi gājieni;
+2. paplašināšana - pievieno vienu neizmēģinātu gājienu;
+3. izspēle - no jaunā mezgla spēlē nejaušus gājienus līdz spēles beigām
+   tieši uz skaitļu skaitu masīva (bez GameState objektiem);
+4. atpakaļizplatīšana - uzvara 1, neizšķirts 0.5, zaudējums 0.
+
+Tas ir "anytime" algoritms: jo vairāk izspēļu (playouts) vai laika
+(time_budget), jo labāks gājiens. Izvēlas visvairāk apmeklēto saknes gājienu.
+
+Koku izmanto atkārtoti: nākamajā gājienā par sakni kļūst tas mazmazbērns
+(AI gājiens + pretinieka atbilde), kas atbilst jaunajam stāvoklim, un tā
+apakškoks ar visām jau veiktajām izspēlēm saglabājas.
+"""
+
+import math
+import random
+import time
+
+from GameState import make_state, apply_sequence_move
+
+# Izspēļu skaits vienam gājienam
+PLAYOUTS = 2000
+# UCB1 izpētes koeficients (sqrt(2) - teorētiskā vērtība uzvaru īpatsvaram 0..1)
+EXPLORATION = math.sqrt(2)
+
+
+# Izspēles gājienu kodi: 1..4 - take, 5 - split2, 6 - split4
+TAKE1, TAKE2, TAKE3, TAKE4, SPLIT2, SPLIT4 = range(1, 7)
+
+# Atļautie gājienu kodi pēc maskas: bits v - 1 iestatīts, ja virknē ir skaitlis v
+AVAILABLE = []
+for _mask in range(16):
+    _moves = []
+    if _mask & 1:
+        _moves.append(TAKE1)
+    if _mask & 2:
+        _moves += [TAKE2, SPLIT2]
+    if _mask & 4:
+        _moves.append(TAKE3)
+    if _mask & 8:
+        _moves += [TAKE4, SPLIT4]
+    AVAILABLE.append(tuple(_moves))
+del _mask, _moves
+
+
+def playout(counts, mover, opponent, rng=random):
+    """
+    Nejauša izspēle līdz spēles beigām. counts - skaitļu skaiti [_, c1, c2, c3, c4];
+    mover/opponent - punkti spēlētājam, kuram gājiens, un pretiniekam.
+    Atgriež rezultātu spēlētājam, kuram bija gājiens: 1, 0.5 vai 0.
+    """
+    c1, c2, c3, c4 = counts[1], counts[2], counts[3], counts[4]
+    random_index = rng.randrange
+    # Pēc katra gājiena puses samainās; flipped - vai 'mover' tagad ir sākotnējais pretinieks
+    flipped = False
+    while c1 or c2 or c3 or c4:
+        options = AVAILABLE[(c1 > 0) | (c2 > 0) << 1 | (c3 > 0) << 2 | (c4 > 0) << 3]
+        move = options[random_index(len(options))]
+        if move == TAKE1:
+            c1 -= 1
+            mover += 1
+        elif move == TAKE2:
+            c2 -= 1
+            mover += 2
+        elif move == TAKE3:
+            c3 -= 1
+            mover += 3
+        elif move == TAKE4:
+            c4 -= 1
+            mover += 4
+        elif move == SPLIT2:
+            # 2 -> 1, 1, pretiniekam +1
+            c2 -= 1
+            c1 += 2
+            opponent += 1
+        else:
+            # split4: 4 -> 2, 2, pretiniekam -1 (ne zem 0)
+            c4 -= 1
+            c2 += 2
+            if opponent:
+                opponent -= 1
+        mover, opponent = opponent, mover
+        flipped = not flipped
+
+    if flipped:
+        mover, opponent = opponent, mover
+    if mover > opponent:
+        return 1.0
+    return 0.5 if mover == opponent else 0.0
+
+
+class Node:
+    """
+    wins - rezultātu summa spēlētājam, kurš izdarīja gājienu 'move' (vecāka gājiena izdarītājam).
+    """
+    __slots__ = ("move", "parent", "children", "untried", "visits", "wins")
+
+    def __init__(self, move, parent, untried):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+
+    def select_child(self, exploration):
+        log_visits = math.log(self.visits)
+        best = None
+        best_value = -1.0
+        for child in self.children:
+            value = (child.wins / child.visits
+                     + exploration * math.sqrt(log_visits / child.visits))
+            if value > best_value:
+                best_value = value
+                best = child
+        return best
+
+
+class MCTS:
+    """
+    playouts    - izspēļu skaits vienam gājienam;
+    time_budget - laiks sekundēs vienam gājienam (ja dots, ierobežo arī to);
+    exploration - UCB1 koeficients;
+    rng         - random.Random vai modulis random.
+
+    Objekts atceras pēdējo koku, tāpēc viena spēle jāspēlē ar vienu objektu.
+    """
+
+    def __init__(self, playouts=PLAYOUTS, time_budget=None, exploration=EXPLORATION,
+                 rng=random):
+        self.playouts = playouts
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.rng = rng
+        self.root = None
+        self.root_state = None
+        # Cik izspēļu bija atkārtoti izmantotajā kokā pēdējā gājiena sākumā
+        self.reused = 0
+
+    def _reuse(self, state):
+        """
+        Atrod esošajā kokā mezglu, kas atbilst 'state' (dziļumā 1 vai 2), vai None.
+        """
+        if self.root is None:
+            return None
+        key = state.key()
+        if self.root_state.key() == key:
+            return self.root
+        for child in self.root.children:
+            after = self.root_state.copy()
+            after.make(child.move)
+            if after.key() == key:
+                return child
+            for grandchild in child.children:
+                reply = after.copy()
+                reply.make(grandchild.move)
+                if reply.key() == key:
+                    return grandchild
+        return None
+
+    def best_move(self, state, stats=None):
+        """
+        Labākais gājiens stāvoklī 'state' tam, kuram ir gājiens, vai None, ja gājienu nav.
+        """
+        if state.is_terminal():
+            return None
+        root = self._reuse(state)
+        if root is None:
+            root = Node(None, None, state.moves())
+        root.parent = None
+        self.root = root
+        self.root_state = state.copy()
+        self.reused = root.visits
+
+        rng = self.rng
+        exploration = self.exploration
+        deadline = (time.perf_counter() + self.time_budget
+                    if self.time_budget is not None else None)
+        max_ply = 0
+        for i in range(self.playouts):
+            if deadline is not None and i and time.perf_counter() >= deadline:
+                break
+            node = root
+            current = state.copy()
+            ply = 0
+            # 1. Izvēle
+            while not node.untried and node.children:
+                node = node.select_child(exploration)
+                current.make(node.move)
+                ply += 1
+                if stats is not None:
+                    stats.record_node(ply)
+            # 2. Paplašināšana
+            if node.untried:
+                move = node.untried.pop(rng.randrange(len(node.untried)))
+                current.make(move)
+                child = Node(move, node, current.moves())
+                node.children.append(child)
+                node = child
+                ply += 1
+                if stats is not None:
+                    stats.record_node(ply)
+            max_ply = max(max_ply, ply)
+            # 3. Izspēle (rezultāts spēlētājam, kuram gājiens mezglā 'node')
+            if current.ai_turn:
+                mover, opponent = current.ai_score, current.human_score
+            else:
+                mover, opponent = current.human_score, current.ai_score
+            result = playout(current.counts, mover, opponent, rng)
+            # 4. Atpakaļizplatīšana: mezgla 'wins' ir pretējā spēlētāja rezultāts
+            while node is not None:
+                node.visits += 1
+                node.wins += 1.0 - result
+                result = 1.0 - result
+                node = node.parent
+
+        if stats is not None:
+            stats.source = "mcts"
+            stats.depth = max_ply
+        best = max(root.children, key=lambda child: child.visits)
+        return best.move
+
+
+# Kopīgais dzinējs spēlei pret cilvēku (koks saglabājas starp gājieniem)
+MCTS_ENGINE = MCTS()
+
+
+def find_best_move(sequence, ai_score, human_score, ai_turn=True, engine=MCTS_ENGINE,
+                   stats=None):
+    """
+    Atgriež kanonisku gājienu (action, value) vai None, ja virkne ir tukša.
+    """
+    return engine.best_move(make_state(sequence, ai_score, human_score, ai_turn), stats)
+
+
+def ai_move(sequence, ai_score, human_score, stats=None):
+    """
+    AI gājiens ar MCTS; atgriež (new_sequence, new_ai_score, new_human_score).
+    """
+    start = time.perf_counter()
+    move = find_best_move(sequence, ai_score, human_score, stats=stats)
+    if stats is not None:
+        stats.elapsed = time.perf_counter() - start
+    if move is None:
+        return sequence, ai_score, human_score
+    return apply_sequence_move(sequence, ai_score, human_score, move, ai_turn=True)
@@ -1,274 +1,32 @@
 import pygame
 import random
-import sys
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 
 # ======================================================================
 # ======================== MINIMAX & ALPHA-BETA ========================
 # ======================================================================
-# --------- Minimax Implementation --------- #
-import copy
-
-def generate_moves_minimax(sequence):
-    """
-    Funkcija, kas ģenerē visus iespējamos gājienus (take vai split),
-    ko spēlētājs var veikt dotajā stāvoklī (sequence).
-    """
-    moves = []
-    for i, val in enumerate(sequence):
-        # 'take' skaitli
-        moves.append(("take", i))
-        # ja skaitlis == 2, var dalīt 2
-        if val == 2:
-            moves.append(("split2", i))
-        # ja skaitlis == 4, var dalīt 4
-        elif val == 4:
-            moves.append(("split4", i))
-    return moves
-
-def apply_move_minimax(sequence, ai_score, player_score, move, is_ai_turn):
-    """
-    Funkcija, kas pielieto izvēlēto gājienu 'move' (take vai split)
-    un atgriež jauno sequence, ai_score, player_score.
-    """
-    move_type, index = move
-    seq = copy.deepcopy(sequence)
-    new_ai = ai_score
-    new_player = player_score
-
-    val = seq[index]
-    if move_type == "take":
-        del seq[index]
-        if is_ai_turn:
-            new_ai += val
-        else:
-            new_player += val
-
-    elif move_type == "split2":
-        # 2 -> [1,1], pretiniekam +1
-        del seq[index]
-        seq.insert(index, 1)
-        seq.insert(index + 1, 1)
-        if is_ai_turn:
-            new_player += 1
-        else:
-            new_ai += 1
-
-    elif move_type == "split4":
-        # 4 -> [2,2], pretiniekam -1 (nezem nulles)
-        del seq[index]
-        seq.insert(index, 2)
-        seq.insert(index + 1, 2)
-        if is_ai_turn:
-            new_player = max(0, new_player - 1)
-        else:
-            new_ai = max(0, new_ai - 1)
-
-    return seq, new_ai, new_player
-
-def minimax(sequence, ai_score, player_score, depth, is_ai_turn):
-    """
-    Minimax algoritms ar fiksētu 'depth'.
-    Atgriež stāvokļa vērtību: (AI_score - player_score).
-    """
-    # Ja nav gājienu vai dziļums sasniegts, tad atgriež heuristiku (AI - Player)
-    if depth == 0 or not sequence:
-        return ai_score - player_score
-
-    moves = generate_moves_minimax(sequence)
-
-    if is_ai_turn:
-        max_eval = float('-inf')
-        for move in moves:
-            new_seq, new_ai, new_player = apply_move_minimax(sequence, ai_score, player_score, move, True)
-            eval_val = minimax(new_seq, new_ai, new_player, depth - 1, False)
-            max_eval = max(max_eval, eval_val)
-        return max_eval
-    else:
-        min_eval = float('inf')
-        for move in moves:
-            new_seq, new_ai, new_player = apply_move_minimax(sequence, ai_score, player_score, move, False)
-            eval_val = minimax(new_seq, new_ai, new_player, depth - 1, True)
-            min_eval = min(min_eval, eval_val)
-        return min_eval
-
-def find_best_move_minimax(sequence, ai_score, player_score):
-    """
-    Atrod labāko gājienu, izmantojot Minimax.
-    """
-    # Ja secības garums <= 7, padziļinātais dziļums 4, citādi 3
-    depth = 4 if len(sequence) <= 7 else 3
-    best_value = float('-inf')
-    best_move = None
-
-    moves = generate_moves_minimax(sequence)
-    if not moves:
-        return None
-
-    for move in moves:
-        new_seq, new_ai, new_player = apply_move_minimax(sequence, ai_score, player_score, move, True)
-        eval_val = minimax(new_seq, new_ai, new_player, depth - 1, False)
-        if eval_val > best_value:
-            best_value = eval_val
-            best_move = move
-
-    return best_move
-
-def ai_move_minimax(sequence, ai_score, player_score):
-    """
-    Veic AI gājienu, izmantojot Minimax.
-    Atgriež (new_sequence, new_ai_score, new_player_score).
-    """
-    move = find_best_move_minimax(sequence, ai_score, player_score)
-    if move is None:
-        # nav gājienu
-        return sequence, ai_score, player_score
-
-    new_seq, new_ai, new_player = apply_move_minimax(sequence, ai_score, player_score, move, True)
-    return new_seq, new_ai, new_player
-
-
-# --------- Alpha-Beta Implementation --------- #
-INF = float('inf')
-
-def generate_moves_ab(sequence):
-    """
-    Līdzīgi kā generate_moves_minimax, bet atsevišķi
-    priekš Alpha-Beta (lai neizraisītu kolīzijas).
-    """
-    moves = []
-    for i, value in enumerate(sequence):
-        moves.append(("take", i, value))
-        if value == 2:
-            moves.append(("split2", i, value))
-        elif value == 4:
-            moves.append(("split4", i, value))
-    return moves
-
-def apply_move_ab(sequence, ai_score, human_score, current_turn_is_ai, move):
-    """
-    Pielieto norādīto gājienu (take, split2, split4) un atgriež jauno stāvokli.
-    """
-    new_sequence = sequence.copy()
-    action, index, value = move
-
-    # Lokālās kopijas
-    new_ai = ai_score
-    new_human = human_score
-
-    if action == "take":
-        new_sequence.pop(index)
-        if current_turn_is_ai:
-            new_ai += value
-        else:
-            new_human += value
-
-    elif action == "split2":
-        new_sequence[index:index+1] = [1, 1]
-        if current_turn_is_ai:
-            new_human += 1
-        else:
-            new_ai += 1
-
-    elif action == "split4":
-        new_sequence[index:index+1] = [2, 2]
-        if current_turn_is_ai:
-            new_human = max(0, new_human - 1)
-        else:
-            new_ai = max(0, new_ai - 1)
-
-    return new_sequence, new_ai, new_human, not current_turn_is_ai
-
-def alphabeta(sequence, ai_score, human_score, depth, alpha, beta, current_turn_is_ai):
-    """
-    Alpha-Beta algoritms, kas atgriež heuristiku (ai_score - human_score).
-    """
-    moves = generate_moves_ab(sequence)
-    if depth == 0 or len(moves) == 0:
-        return ai_score - human_score
-
-    if current_turn_is_ai:
-        value = -INF
-        for move in moves:
-            new_seq, new_ai, new_human, new_turn = apply_move_ab(sequence, ai_score, human_score, True, move)
-            score = alphabeta(new_seq, new_ai, new_human, depth - 1, alpha, beta, new_turn)
-            value = max(value, score)
-            alpha = max(alpha, value)
-            if alpha >= beta:
-                break
-        return value
-    else:
-        value = INF
-        for move in moves:
-            new_seq, new_ai, new_human, new_turn = apply_move_ab(sequence, ai_score, human_score, False, move)
-            score = alphabeta(new_seq, new_ai, new_human, depth - 1, alpha, beta, new_turn)
-            value = min(value, score)
-            beta = min(beta, value)
-            if beta <= alpha:
-                break
-        return value
-
-def find_best_move_ab(sequence, ai_score, human_score, current_turn_is_ai=True):
-    """
-    Izmantojot Alpha-Beta, atrod labāko gājienu dotajā stāvoklī.
-    """
-    if len(sequence) <= 7:
-        depth = 4
-    else:
-        depth = 3
-
-    best_move = None
-
-    if current_turn_is_ai:
-        best_value = -INF
-        possible_moves = generate_moves_ab(sequence)
-        if not possible_moves:
-            return None
-
-        for move in possible_moves:
-            new_seq, new_ai, new_human, new_turn = apply_move_ab(sequence, ai_score, human_score, True, move)
-            score = alphabeta(new_seq, new_ai, new_human, depth - 1, -INF, INF, new_turn)
-            if best_move is None or score > best_value:
-                best_value = score
-                best_move = move
-    else:
-        # (Nav obligāti vajadzīgs šai spēlei, jo AI mēs saucam ar current_turn_is_ai=True)
-        best_value = INF
-        possible_moves = generate_moves_ab(sequence)
-        if not possible_moves:
-            return None
-
-        for move in possible_moves:
-            new_seq, new_ai, new_human, new_turn = apply_move_ab(sequence, ai_score, human_score, False, move)
-            score = alphabeta(new_seq, new_ai, new_human, depth - 1, -INF, INF, new_turn)
-            if best_move is None or score < best_value:
-                best_value = score
-                best_move = move
-
-    return best_move
-
-def ai_move_alphabeta(sequence, ai_score, player_score):
-    """
-    Veic AI gājienu, izmantojot Alpha-Beta.
-    Atgriež (new_sequence, new_ai_score, new_player_score).
-    """
-    move = find_best_move_ab(sequence, ai_score, player_score, current_turn_is_ai=True)
-    if move is None:
-        # Nav gājienu
-        return sequence, ai_score, player_score
-
-    new_sequence, new_ai, new_human, _ = apply_move_ab(sequence, ai_score, player_score, True, move)
-    return new_sequence, new_ai, new_human
+# Abi algoritmi izmanto vienu negamax meklēšanas dzinēju (Engine.py):
+# MiniMax.py - bez nogriešanas / precīzs atrisinājums, AlfaBeta.py - Alpha-Beta.
+# Trešais algoritms - Monte Carlo koka meklēšana (MCTS.py).
+# Gājieni ir kanoniskā formā (action, value), piem. ("take", 4).
+from MiniMax import ai_move as ai_move_minimax
+from AlfaBeta import ai_move as ai_move_alphabeta
+from MCTS import ai_move as ai_move_mcts
+from GameRecord import find_move, open_default as open_game_recorder
+from GameState import apply_sequence_move
+from Ponder import Ponderer
+from ProfileStore import open_default as open_profile_store
+from SearchStats import SearchStats
 
 # ======================================================================
 # ============================ PYGAME INTERFACE =========================
 # ======================================================================
 
-pygame.init()
-
 # --- Window config ---
 WIDTH, HEIGHT = 1000, 600
-SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Number Splitting Game (Pygame)")
+# Logu un fontus izveido init_display(), nevis importējot moduli
+SCREEN = None
 
 # --- Colors ---
 WHITE = (255, 255, 255)
@@ -278,10 +36,50 @@ RED   = (255, 0, 0)
 GREEN = (0, 200, 0)
 BLUE  = (0, 100, 255)
 
-# --- Fonts ---
-FONT_BIG = pygame.font.SysFont("Arial", 40, bold=True)
-FONT_MED = pygame.font.SysFont("Arial", 30)
-FONT_SML = pygame.font.SysFont("Arial", 24)
+# --- Fonts (init_display) ---
+FONT_BIG = None
+FONT_MED = None
+FONT_SML = None
+FONT_DBG = None
+
+def init_display():
+    """
+    Inicializē pygame, atver logu un ielādē fontus. Izsauc main();
+    atkārtoti izsaukta neko nedara. Līdz tam moduli var importēt bez loga
+    (piem., ai_move() vai generate_sequence() izmantošanai citos procesos).
+    """
+    global SCREEN, FONT_BIG, FONT_MED, FONT_SML, FONT_DBG
+    if SCREEN is not None:
+        return
+    pygame.init()
+    SCREEN = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Number Splitting Game (Pygame)")
+
+    FONT_BIG = pygame.font.SysFont("Arial", 40, bold=True)
+    FONT_MED = pygame.font.SysFont("Arial", 30)
+    FONT_SML = pygame.font.SysFont("Arial", 24)
+    FONT_DBG = pygame.font.SysFont("Courier New", 16)
+
+# --- Text surface cache ---
+TEXT_CACHE_SIZE = 256   # cik atveidotu tekstu glabā (vecākie tiek izmesti)
+_text_cache = OrderedDict()
+
+def render_text(font, text, color):
+    """
+    Tas pats, kas font.render(text, True, color), bet atveidoto virsmu glabā
+    kešā pēc (font, text, color). Statiskie uzraksti un skaitļi 1..4 tiek
+    atveidoti vienreiz, pēc tam tikai uzzīmēti (blit).
+    """
+    key = (font, text, color)
+    surf = _text_cache.get(key)
+    if surf is None:
+        surf = font.render(text, True, color)
+        _text_cache[key] = surf
+        if len(_text_cache) > TEXT_CACHE_SIZE:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
+    return surf
 
 # --- Game states ---
 STATE_MAIN_MENU       = 0
@@ -293,20 +91,73 @@ STATE_GAME_OVER_LOSE  = 5
 STATE_RULES           = 6
 STATE_GAME_OVER_DRAW  = 7   # JAUNS stāvoklis priekš neizšķirta
 
+# --- AI timing ---
+AI_MIN_DELAY_MS = 500   # AI gājienu parāda ne ātrāk kā pēc šī laika (pārklājas ar meklēšanu)
+AI_DONE_EVENT = pygame.USEREVENT + 1   # AI pavediens to ievieto rindā, kad gājiens atrasts
+
+# --- Debug overlay (F3) ---
+DEBUG_MAX_PLIES = 12    # cik ply rindas rāda meklēšanas atskaitē
+
+# --- Sequence grid ---
+# Virknes skaitļi ir režģī: šūnas indekss = rinda * GRID_COLS + kolonna
+GRID_X, GRID_Y = 50, 100
+CELL_W, CELL_H = 50, 50
+CELL_GAP = 10
+GRID_COLS = (WIDTH - 2 * GRID_X + CELL_GAP) // (CELL_W + CELL_GAP)
+
+def cell_rect(index):
+    """
+    Virknes skaitļa ar indeksu 'index' taisnstūris uz ekrāna.
+    """
+    row, col = divmod(index, GRID_COLS)
+    return pygame.Rect(GRID_X + col * (CELL_W + CELL_GAP),
+                       GRID_Y + row * (CELL_H + CELL_GAP), CELL_W, CELL_H)
+
+def hit_test(pos, length):
+    """
+    Virknes indekss zem punkta 'pos' (peles koordinātas) vai None,
+    ja punkts ir starp šūnām vai aiz virknes beigām (virknes garums 'length').
+    """
+    x, y = pos[0] - GRID_X, pos[1] - GRID_Y
+    if x < 0 or y < 0:
+        return None
+    col, dx = divmod(x, CELL_W + CELL_GAP)
+    row, dy = divmod(y, CELL_H + CELL_GAP)
+    if col >= GRID_COLS or dx >= CELL_W or dy >= CELL_H:
+        return None
+    index = row * GRID_COLS + col
+    return index if index < length else None
+
+# --- Dirty-rect rendering ---
+# Spēles ekrāna apgabali, kurus atjauno atsevišķi: punktu rinda augšā un
+# laukums ar virkni un F3 logu (tas var sniegties līdz loga apakšai)
+SCORE_AREA = pygame.Rect(0, 0, WIDTH, 50)
+BOARD_AREA = pygame.Rect(0, 50, WIDTH, HEIGHT - 50)
+
+def dirty_rects(drawn, regions):
+    """
+    regions - {nosaukums: (rect, atslēga)}, kur atslēga apraksta apgabala saturu;
+    drawn - iepriekš uzzīmētie regions. Atgriež to apgabalu taisnstūrus,
+    kuru atslēga mainījusies (tukšs saraksts - nekas nav jāzīmē).
+    """
+    return [rect for name, (rect, key) in regions.items()
+            if name not in drawn or drawn[name][1] != key]
+
 # --- Simple Button class ---
 class Button:
     def __init__(self, x, y, w, h, text, callback,
-                 font=FONT_MED, color=GRAY, text_color=BLACK):
+                 font=None, color=GRAY, text_color=BLACK):
         self.rect = pygame.Rect(x, y, w, h)
         self.text = text
         self.callback = callback
-        self.font = font
+        # Noklusētais fonts ir zināms tikai pēc init_display()
+        self.font = font if font is not None else FONT_MED
         self.color = color
         self.text_color = text_color
 
     def draw(self, surface):
         pygame.draw.rect(surface, self.color, self.rect)
-        text_surf = self.font.render(self.text, True, self.text_color)
+        text_surf = render_text(self.font, self.text, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
@@ -322,28 +173,56 @@ def generate_sequence(length):
     """
     return [random.choice([1, 2, 3, 4]) for _ in range(length)]
 
+# --- Event waiting ---
+def notify_ai_done(future):
+    """
+    Izsauc AI pavediens, kad meklēšana beigusies: pamodina galveno ciklu.
+    """
+    if pygame.display.get_init():
+        pygame.event.post(pygame.event.Event(AI_DONE_EVENT))
+
+def wait_events(timeout):
+    """
+    Gaida nākamo notikumu ne ilgāk kā 'timeout' ms (None - kamēr tāds pienāk,
+    0 - negaida) un atgriež to kopā ar visiem jau rindā esošajiem notikumiem.
+    """
+    if timeout == 0:
+        return pygame.event.get()
+    event = pygame.event.wait() if timeout is None else pygame.event.wait(timeout)
+    if event.type == pygame.NOEVENT:
+        return pygame.event.get()
+    return [event] + pygame.event.get()
+
 # --- AI move dispatcher ---
-def ai_move(sequence, ai_score, player_score, chosen_algo):
+def ai_move(sequence, ai_score, player_score, chosen_algo, stats=None):
     """
-    Funkcija, kas izsauc atbilstošo AI algoritmu (Minimax vai Alpha-Beta),
+    Funkcija, kas izsauc atbilstošo AI algoritmu (Minimax, Alpha-Beta vai MCTS),
     un veic atgriešanu: (sequence, ai_score, player_score).
     Ja algoritms nav izvēlēts, AI veic nejaušu gājienu.
+    Ja padots 'stats' (SearchStats), tajā ieraksta meklēšanas atskaiti.
     """
     if not sequence:
         return sequence, ai_score, player_score
 
     if chosen_algo == "Minimax":
         # Izmantojam Minimax
-        new_seq, new_ai, new_pl = ai_move_minimax(sequence, ai_score, player_score)
+        new_seq, new_ai, new_pl = ai_move_minimax(sequence, ai_score, player_score, stats=stats)
         return new_seq, new_ai, new_pl
 
     elif chosen_algo == "Alpha-Beta":
         # Izmantojam Alpha-Beta
-        new_seq, new_ai, new_pl = ai_move_alphabeta(sequence, ai_score, player_score)
+        new_seq, new_ai, new_pl = ai_move_alphabeta(sequence, ai_score, player_score, stats=stats)
+        return new_seq, new_ai, new_pl
+
+    elif chosen_algo == "MCTS":
+        # Izmantojam MCTS (koks saglabājas starp gājieniem)
+        new_seq, new_ai, new_pl = ai_move_mcts(sequence, ai_score, player_score, stats=stats)
         return new_seq, new_ai, new_pl
 
     else:
         # Ja nav izvēlēts algoritms -> nejaušs gājiens (fallback)
+        if stats is not None:
+            stats.source = "random"
         chosen_value = random.choice(sequence)
         sequence.remove(chosen_value)
         ai_score += chosen_value
@@ -352,7 +231,7 @@ def ai_move(sequence, ai_score, player_score, chosen_algo):
 # --- Screens drawing ---
 def draw_main_menu():
     SCREEN.fill(WHITE)
-    title_surf = FONT_BIG.render("Main Menu", True, BLACK)
+    title_surf = render_text(FONT_BIG, "Main Menu", BLACK)
     title_rect = title_surf.get_rect(center=(WIDTH//2, HEIGHT//4))
     SCREEN.blit(title_surf, title_rect)
 
@@ -361,17 +240,17 @@ def draw_best_level(best_level):
         txt = f"Best level reached: {best_level}"
     else:
         txt = "No best level yet (haven't played/won yet)"
-    text_surf = FONT_SML.render(txt, True, BLACK)
+    text_surf = render_text(FONT_SML, txt, BLACK)
     text_rect = text_surf.get_rect(center=(WIDTH//2, HEIGHT//4 + 50))
     SCREEN.blit(text_surf, text_rect)
 
 def draw_enter_name(player_name):
     SCREEN.fill(WHITE)
-    txt_surf = FONT_BIG.render("Enter your name:", True, BLACK)
+    txt_surf = render_text(FONT_BIG, "Enter your name:", BLACK)
     txt_rect = txt_surf.get_rect(center=(WIDTH//2, HEIGHT//4))
     SCREEN.blit(txt_surf, txt_rect)
 
-    name_surf = FONT_MED.render(player_name, True, BLACK)
+    name_surf = render_text(FONT_MED, player_name, BLACK)
     name_rect = name_surf.get_rect(center=(WIDTH//2, HEIGHT//2))
     pygame.draw.rect(SCREEN, GRAY,
                      (name_rect.x - 10, name_rect.y - 5,
@@ -382,13 +261,13 @@ def draw_enter_name(player_name):
 def draw_choose_settings(player_name, chosen_algo, chosen_length, first_mover, show_error):
     SCREEN.fill(WHITE)
     # Title
-    title_surf = FONT_BIG.render("Game Settings", True, BLACK)
+    title_surf = render_text(FONT_BIG, "Game Settings", BLACK)
     title_rect = title_surf.get_rect(center=(WIDTH//2, 50))
     SCREEN.blit(title_surf, title_rect)
 
     # Player name
     name_text = f"Player: {player_name}"
-    name_surf = FONT_MED.render(name_text, True, BLACK)
+    name_surf = render_text(FONT_MED, name_text, BLACK)
     name_rect = name_surf.get_rect(center=(WIDTH//2, 110))
     SCREEN.blit(name_surf, name_rect)
 
@@ -396,33 +275,33 @@ def draw_choose_settings(player_name, chosen_algo, chosen_length, first_mover, s
     algo_str = chosen_algo if chosen_algo else "Not selected"
     algo_color = RED if (show_error and chosen_algo is None) else BLACK
     algo_text = f"Algorithm: {algo_str}"
-    algo_surf = FONT_SML.render(algo_text, True, algo_color)
+    algo_surf = render_text(FONT_SML, algo_text, algo_color)
     algo_rect = algo_surf.get_rect(center=(WIDTH//2, 160))
     SCREEN.blit(algo_surf, algo_rect)
 
     # Length
     len_text = f"Length: {chosen_length}"
-    len_surf = FONT_SML.render(len_text, True, BLACK)
+    len_surf = render_text(FONT_SML, len_text, BLACK)
     len_rect = len_surf.get_rect(center=(WIDTH//2, 190))
     SCREEN.blit(len_surf, len_rect)
 
     # Who goes first
     fm_text = "Player" if first_mover == "player" else "Computer"
     fm_surf_text = f"Goes first: {fm_text}"
-    fm_surf = FONT_SML.render(fm_surf_text, True, BLACK)
+    fm_surf = render_text(FONT_SML, fm_surf_text, BLACK)
     fm_rect = fm_surf.get_rect(center=(WIDTH//2, 220))
     SCREEN.blit(fm_surf, fm_rect)
 
     # Error message if needed
     if show_error and chosen_algo is None:
         error_msg = "Please select an algorithm!"
-        err_surf = FONT_SML.render(error_msg, True, RED)
+        err_surf = render_text(FONT_SML, error_msg, RED)
         err_rect = err_surf.get_rect(center=(WIDTH//2, 260))
         SCREEN.blit(err_surf, err_rect)
 
 def draw_rules_screen():
     SCREEN.fill(WHITE)
-    title_surf = FONT_BIG.render("Brief Game Description", True, BLACK)
+    title_surf = render_text(FONT_BIG, "Brief Game Description", BLACK)
     title_rect = title_surf.get_rect(center=(WIDTH//2, 50))
     SCREEN.blit(title_surf, title_rect)
 
@@ -440,7 +319,7 @@ def draw_rules_screen():
 
     y_offset = 120
     for line in lines:
-        line_surf = FONT_SML.render(line, True, BLACK)
+        line_surf = render_text(FONT_SML, line, BLACK)
         SCREEN.blit(line_surf, (50, y_offset))
         y_offset += 30
 
@@ -450,71 +329,54 @@ def draw_game_screen(player_name, player_score, ai_name, ai_score,
 
     # Top-left: player name + score
     left_text = f"{player_name} (Score: {player_score})"
-    left_surf = FONT_SML.render(left_text, True, BLACK)
+    left_surf = render_text(FONT_SML, left_text, BLACK)
     SCREEN.blit(left_surf, (20, 20))
 
     # Top-right: AI name + level + score
     right_text = f"{ai_name} Level {level} (Score: {ai_score})"
-    right_surf = FONT_SML.render(right_text, True, BLACK)
+    right_surf = render_text(FONT_SML, right_text, BLACK)
     SCREEN.blit(right_surf, (WIDTH - right_surf.get_width() - 20, 20))
 
     # Top-center: best level
     if best_level > 0:
         center_text = f"Best level: {best_level}"
-        center_surf = FONT_SML.render(center_text, True, BLACK)
+        center_surf = render_text(FONT_SML, center_text, BLACK)
         center_rect = center_surf.get_rect(center=(WIDTH//2, 20))
         SCREEN.blit(center_surf, center_rect)
 
-    # Display the sequence as small "buttons"
-    start_x = 50
-    start_y = 100
-    gap = 10
-    btn_w, btn_h = 50, 50
-
-    global number_buttons
-    number_buttons = []
-
-    x = start_x
-    y = start_y
-    for val in sequence:
-        rect = pygame.Rect(x, y, btn_w, btn_h)
+    # Display the sequence as small "buttons" (grid, see hit_test)
+    for i, val in enumerate(sequence):
+        rect = cell_rect(i)
         pygame.draw.rect(SCREEN, GRAY, rect)
-        val_surf = FONT_SML.render(str(val), True, BLACK)
+        val_surf = render_text(FONT_SML, str(val), BLACK)
         val_rect = val_surf.get_rect(center=rect.center)
         SCREEN.blit(val_surf, val_rect)
 
-        number_buttons.append((rect, val))
-
-        x += btn_w + gap
-        if x + btn_w > WIDTH - 50:
-            x = start_x
-            y += btn_h + gap
-
     # Hints about SHIFT
     shift_text1 = "Shift + click 2 => splits into (1 and 1), giving +1 to opponent."
     shift_text2 = "Shift + click 4 => splits into (2 and 2), subtracting 1 from opponent."
-    st1_surf = FONT_SML.render(shift_text1, True, BLACK)
-    st2_surf = FONT_SML.render(shift_text2, True, BLACK)
+    st1_surf = render_text(FONT_SML, shift_text1, BLACK)
+    st2_surf = render_text(FONT_SML, shift_text2, BLACK)
     SCREEN.blit(st1_surf, (50, HEIGHT - 60))
     SCREEN.blit(st2_surf, (50, HEIGHT - 30))
 
 def draw_game_over_win(player_name):
     SCREEN.fill(WHITE)
-    txt_surf = FONT_BIG.render(f"Congratulations, {player_name}!", True, BLACK)
+    txt_surf = render_text(FONT_BIG, f"Congratulations, {player_name}!", BLACK)
     txt_rect = txt_surf.get_rect(center=(WIDTH//2, HEIGHT//3))
     SCREEN.blit(txt_surf, txt_rect)
 
-    txt_surf2 = FONT_MED.render("You won! What’s next?", True, BLACK)
+    txt_surf2 = render_text(FONT_MED, "You won! What’s next?", BLACK)
     txt_rect2 = txt_surf2.get_rect(center=(WIDTH//2, HEIGHT//2))
     SCREEN.blit(txt_surf2, txt_rect2)
 
 def draw_game_over_lose(ai_name):
     SCREEN.fill(WHITE)
-    txt_surf = FONT_BIG.render("Game Over...", True, BLACK)
+    txt_surf = render_text(FONT_BIG, "Game Over...", BLACK)
     txt_rect = txt_surf.get_rect(center=(WIDTH//2, HEIGHT//3))
     SCREEN.blit(txt_surf, txt_rect)
 
-    txt_surf2 = FONT_MED.render(f"Victory goes to {ai_name}.", True, BLACK)
+    txt_surf2 = render_text(FONT_MED, f"Victory goes to {ai_name}.", BLACK)
     txt_rect2 = txt_surf2.get_rect(center=(WIDTH//2, HEIGHT//2))
     SCREEN.blit(txt_surf2, txt_rect2)
 
@@ -523,19 +385,44 @@ def draw_game_over_draw():
     Zīmējam ekrānu, ja spēle beidzas neizšķirti (player_score == ai_score).
     """
     SCREEN.fill(WHITE)
-    txt_surf = FONT_BIG.render("It's a draw!", True, BLACK)
+    txt_surf = render_text(FONT_BIG, "It's a draw!", BLACK)
     txt_rect = txt_surf.get_rect(center=(WIDTH//2, HEIGHT//3))
     SCREEN.blit(txt_surf, txt_rect)
 
-    txt_surf2 = FONT_MED.render("Tie game. Continue or go to Main Menu?", True, BLACK)
+    txt_surf2 = render_text(FONT_MED, "Tie game. Continue or go to Main Menu?", BLACK)
     txt_rect2 = txt_surf2.get_rect(center=(WIDTH//2, HEIGHT//2))
     SCREEN.blit(txt_surf2, txt_rect2)
 
+def draw_debug_overlay(stats):
+    """
+    Atkļūdošanas logs (F3) ar pēdējā AI gājiena meklēšanas atskaiti.
+    """
+    if stats is None:
+        lines = ["No AI move yet"]
+    else:
+        lines = stats.summary_lines()
+        for ply, (nodes, cutoffs) in enumerate(zip(stats.nodes, stats.cutoffs)):
+            if ply == DEBUG_MAX_PLIES:
+                lines.append(f"... {len(stats.nodes) - ply} more plies")
+                break
+            lines.append(f"ply {ply:2}: nodes={nodes} cutoffs={cutoffs}")
+
+    line_h = FONT_DBG.get_linesize()
+    panel = pygame.Rect(WIDTH - 540, 230, 520, 12 + line_h * len(lines))
+    pygame.draw.rect(SCREEN, WHITE, panel)
+    pygame.draw.rect(SCREEN, BLUE, panel, 2)
+    y = panel.y + 6
+    for line in lines:
+        SCREEN.blit(render_text(FONT_DBG, line, BLACK), (panel.x + 8, y))
+        y += line_h
+
 # ======================================================================
 # ============================= MAIN LOOP ==============================
 # ======================================================================
 def main():
-    clock = pygame.time.Clock()
+    init_display()
+    # Peles kustība neko nemaina, tāpēc lai tā ciklu nemodina
+    pygame.event.set_blocked(pygame.MOUSEMOTION)
 
     # States
     state = STATE_MAIN_MENU
@@ -552,6 +439,14 @@ def main():
     current_level = 1
     best_level = 0
 
+    # Labākais līmenis un statistika saglabājas starp palaišanām (ProfileStore.py);
+    # None, ja datubāzi nevar atvērt
+    store = open_profile_store()
+    # Katras spēles gājieni tiek pierakstīti games.jsonl (GameRecord.py)
+    recorder = open_game_recorder()
+    ai_moves = 0
+    ai_think_time = 0.0
+
     # Game data
     player_score = 0
     ai_score = 0
@@ -560,16 +455,50 @@ def main():
 
     show_error = False
 
+    # AI meklē fona pavedienā, lai galvenais cikls turpinātu zīmēt un apstrādāt notikumus
+    ai_executor = ThreadPoolExecutor(max_workers=1)
+    ai_future = None
+    ai_started = 0
+    # Cilvēka gājiena laikā AI jau meklē atbildes uz ticamākajiem gājieniem (Ponder.py)
+    ponderer = Ponderer()
+
+    # Meklēšanas atskaite: ai_stats aizpilda fona pavediens, last_report rāda F3 logā
+    debug_overlay = False
+    ai_stats = None
+    last_report = None
+
+    # Pēdējais uzzīmētais ekrāns; None - nākamajā kadrā jāpārzīmē viss logs
+    drawn_screen = None
+    drawn_regions = {}
+
+    def screen_view():
+        """
+        Atgriež (ekrāna atslēga, apgabali). Ja mainās ekrāna atslēga, pārzīmē
+        visu logu; spēles laikā atjauno tikai tos apgabalus, kuru saturs mainījies.
+        """
+        if state != STATE_GAME:
+            return (state, player_name, chosen_algo, chosen_length, first_mover,
+                    show_error, best_level), {}
+        return (state, player_name, current_level, best_level), {
+            "score": (SCORE_AREA, (player_score, ai_score)),
+            "board": (BOARD_AREA, (tuple(sequence), debug_overlay and last_report)),
+        }
+
     # --- Main Menu Buttons ---
     def start_enter_name():
         nonlocal state
         state = STATE_ENTER_NAME
 
+    def exit_game():
+        # Iziet caur cikla beigām, lai profili tiktu saglabāti
+        nonlocal running
+        running = False
+
     buttons_main_menu = [
         Button(WIDTH//2 - 100, HEIGHT//2 - 30, 200, 60, "Play",
                callback=start_enter_name, font=FONT_MED, color=GREEN),
         Button(WIDTH//2 - 100, HEIGHT//2 + 50, 200, 60, "Exit",
-               callback=lambda: sys.exit(0), font=FONT_MED, color=RED)
+               callback=exit_game, font=FONT_MED, color=RED)
     ]
 
     # --- Choose Settings Buttons ---
@@ -583,6 +512,11 @@ def main():
         chosen_algo = "Alpha-Beta"
         show_error = False
 
+    def set_algo_mcts():
+        nonlocal chosen_algo, show_error
+        chosen_algo = "MCTS"
+        show_error = False
+
     def length_minus():
         nonlocal chosen_length
         if chosen_length > 15:
@@ -610,8 +544,9 @@ def main():
             state = STATE_RULES
 
     buttons_choose_settings = [
-        Button(WIDTH//2 - 160, 280, 140, 50, "Minimax", set_algo_minimax),
-        Button(WIDTH//2 +  20, 280, 140, 50, "Alpha-Beta", set_algo_alphabeta),
+        Button(WIDTH//2 - 230, 280, 140, 50, "Minimax", set_algo_minimax),
+        Button(WIDTH//2 -  70, 280, 140, 50, "Alpha-Beta", set_algo_alphabeta),
+        Button(WIDTH//2 +  90, 280, 140, 50, "MCTS", set_algo_mcts),
 
         Button(WIDTH//2 - 160, 350, 60, 50, "-Len", length_minus),
         Button(WIDTH//2 + 100, 350, 60, 50, "+Len", length_plus),
@@ -627,12 +562,18 @@ def main():
         """
         Iniciē jaunu raundu (jaunu spēli) ar izvēlētajiem iestatījumiem.
         """
-        nonlocal state, sequence, player_score, ai_score, player_turn
+        nonlocal state, sequence, player_score, ai_score, player_turn, ai_moves, ai_think_time
         sequence = generate_sequence(chosen_length)
         player_score = 0
         ai_score = 0
+        ai_moves = 0
+        ai_think_time = 0.0
         player_turn = (first_mover == "player")
         state = STATE_GAME
+        if recorder:
+            recorder.start_game(sequence, player_name, chosen_algo, current_level, first_mover)
+        if player_turn:
+            ponderer.start(sequence, ai_score, player_score, chosen_algo)
 
     buttons_rules_screen = [
         Button(WIDTH//2 - 100, HEIGHT - 100, 200, 60, "Start",
@@ -684,10 +625,19 @@ def main():
         result var būt: 'player' (win), 'ai' (lose) vai 'draw' (neizšķirts).
         """
         nonlocal state, best_level, current_level
+        ponderer.cancel()
+        if recorder:
+            recorder.end_game(player_score, ai_score, result)
+        won_level = current_level if result == 'player' else 0
+        if store:
+            # Ieraksta fona pavediens - zīmēšana negaida
+            best_level = store.record_game(player_name, won_level,
+                                           ai_moves, ai_think_time).best_level
+        else:
+            best_level = max(best_level, won_level)
+
         if result == 'player':
             # Player win
-            if current_level > best_level:
-                best_level = current_level
             state = STATE_GAME_OVER_WIN
         elif result == 'ai':
             # Player lose
@@ -696,21 +646,56 @@ def main():
             # draw
             state = STATE_GAME_OVER_DRAW
 
+    def check_game_over():
+        """
+        Ja virkne ir tukša, spēle beidzas un uzvarētāju nosaka pēc punktiem.
+        """
+        if len(sequence) == 0:
+            if player_score > ai_score:
+                end_game("player")
+            elif ai_score > player_score:
+                end_game("ai")
+            else:
+                end_game("draw")
+
+    def next_timeout():
+        """
+        Cik ilgi cikls drīkst gulēt, gaidot notikumu (wait_events() 'timeout').
+        Bez tā cikls pamostas tikai no ievades vai AI_DONE_EVENT.
+        """
+        if drawn_screen is None:
+            return 0
+        if state == STATE_GAME and not player_turn:
+            if ai_future is None:
+                return 0
+            if ai_future.done():
+                # Gājiens gatavs - jāpagaida tikai līdz AI_MIN_DELAY_MS beigām
+                return max(0, AI_MIN_DELAY_MS - (pygame.time.get_ticks() - ai_started))
+        return None
+
     # --- Main Loop ---
     running = True
     while running:
-        clock.tick(30)
-
-        for event in pygame.event.get():
+        for event in wait_events(next_timeout()):
             if event.type == pygame.QUIT:
                 running = False
 
+            if event.type == pygame.VIDEOEXPOSE:
+                # Logs bija aizsegts - jāpārzīmē viss
+                drawn_screen = None
+
+            if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                debug_overlay = not debug_overlay
+                continue
+
             # Handle text input for player's name
             if state == STATE_ENTER_NAME:
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_RETURN:
                         if len(player_name.strip()) == 0:
                             player_name = "Player"
+                        if store:
+                            best_level = store.profile(player_name).best_level
                         state = STATE_CHOOSE_SETTINGS
                     elif event.key == pygame.K_BACKSPACE:
                         player_name = player_name[:-1]
@@ -735,48 +720,29 @@ def main():
                 if player_turn:
                     # Player clicks
                     if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                        mouse_pos = event.pos
-                        for rect, val in number_buttons:
-                            if rect.collidepoint(mouse_pos) and val in sequence:
-                                mods = pygame.key.get_mods()
-                                if mods & pygame.KMOD_SHIFT:
-                                    # Shift-click -> split
-                                    if val == 2:
-                                        idx_in_seq = sequence.index(val)
-                                        sequence.pop(idx_in_seq)
-                                        sequence.insert(idx_in_seq, 1)
-                                        sequence.insert(idx_in_seq+1, 1)
-                                        # Splitting 2: +1 to AI
-                                        ai_score += 1
-                                    elif val == 4:
-                                        idx_in_seq = sequence.index(val)
-                                        sequence.pop(idx_in_seq)
-                                        sequence.insert(idx_in_seq, 2)
-                                        sequence.insert(idx_in_seq+1, 2)
-                                        # Splitting 4: -1 to AI
-                                        ai_score = max(0, ai_score - 1)
-                                else:
-                                    # Take
-                                    player_score += val
-                                    idx_in_seq = sequence.index(val)
-                                    sequence.pop(idx_in_seq)
-
+                        index = hit_test(event.pos, len(sequence))
+                        if index is not None:
+                            val = sequence[index]
+                            mods = pygame.key.get_mods()
+                            if mods & pygame.KMOD_SHIFT:
+                                # Shift-click -> split (tikai 2 un 4)
+                                move = {2: ("split2", 2), 4: ("split4", 4)}.get(val)
+                            else:
+                                move = ("take", val)
+
+                            if move is not None:
+                                # Gājiens attiecas tieši uz noklikšķināto skaitli
+                                sequence, ai_score, player_score = apply_sequence_move(
+                                    sequence, ai_score, player_score, move,
+                                    ai_turn=False, index=index)
                                 player_turn = False
-                                break
-                else:
-                    # AI turn
-                    pygame.time.wait(500)  # AI "thinking"
-                    sequence, ai_score, player_score = ai_move(sequence, ai_score, player_score, chosen_algo)
-                    player_turn = True
+                                ponderer.cancel()
+                                if recorder:
+                                    recorder.record_move("player", move, index,
+                                                         player_score, ai_score)
 
                 # Check if sequence is empty -> end game
-                if len(sequence) == 0:
-                    if player_score > ai_score:
-                        end_game("player")
-                    elif ai_score > player_score:
-                        end_game("ai")
-                    else:
-                        end_game("draw")
+                check_game_over()
 
             elif state == STATE_GAME_OVER_WIN:
                 for btn in buttons_game_over_win:
@@ -790,7 +756,52 @@ def main():
                 for btn in buttons_game_over_draw:
                     btn.check_event(event)
 
-        # --- Rendering ---
+        # --- AI turn (background worker) ---
+        if state == STATE_GAME and not player_turn:
+            if ai_future is None:
+                ai_started = pygame.time.get_ticks()
+                pondered = ponderer.lookup(sequence, ai_score, player_score, chosen_algo)
+                if pondered is not None:
+                    # Atbilde atrasta cilvēka gājiena laikā - meklēt nav vajadzības
+                    move, ai_stats = pondered
+                    ai_stats.source = f"{ai_stats.source} (pondered)"
+                    ai_future = Future()
+                    ai_future.set_result(apply_sequence_move(sequence, ai_score, player_score,
+                                                             move, ai_turn=True))
+                else:
+                    # AI saņem virknes kopiju - spēles stāvokli maina tikai galvenais pavediens
+                    ai_stats = SearchStats()
+                    ai_future = ai_executor.submit(ai_move, list(sequence), ai_score,
+                                                   player_score, chosen_algo, ai_stats)
+                    ai_future.add_done_callback(notify_ai_done)
+            elif (ai_future.done()
+                  and pygame.time.get_ticks() - ai_started >= AI_MIN_DELAY_MS):
+                before = sequence
+                sequence, ai_score, player_score = ai_future.result()
+                last_report = ai_stats
+                if recorder:
+                    move, index = find_move(before, sequence)
+                    recorder.record_move("ai", move, index, player_score, ai_score,
+                                         ai_stats.elapsed * 1000)
+                ai_moves += 1
+                ai_think_time += ai_stats.elapsed
+                ai_future = None
+                player_turn = True
+                check_game_over()
+                if state == STATE_GAME:
+                    ponderer.start(sequence, ai_score, player_score, chosen_algo)
+
+        # --- Rendering (tikai mainītie apgabali) ---
+        view, regions = screen_view()
+        if view != drawn_screen:
+            rects = None
+        else:
+            rects = dirty_rects(drawn_regions, regions)
+            if not rects:
+                # Nekas nav mainījies - nezīmējam un neatjaunojam ekrānu
+                continue
+        drawn_screen, drawn_regions = view, regions
+
         if state == STATE_MAIN_MENU:
             draw_main_menu()
             draw_best_level(best_level)
@@ -814,6 +825,8 @@ def main():
             draw_game_screen(player_name, player_score,
                              ai_name, ai_score,
                              current_level, best_level, sequence)
+            if debug_overlay:
+                draw_debug_overlay(last_report)
 
         elif state == STATE_GAME_OVER_WIN:
             draw_game_over_win(player_name)
@@ -830,8 +843,17 @@ def main():
             for btn in buttons_game_over_draw:
                 btn.draw(SCREEN)
 
-        pygame.display.flip()
-
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
+
+    ponderer.cancel()
+    ai_executor.shutdown(wait=False, cancel_futures=True)
+    if store:
+        store.close()
+    if recorder:
+        recorder.close()
     pygame.quit()
 
 if __name__ == "__main__":
@@ -1,272 +1,46 @@
+import argparse
+import json
 import random
 import sys
-import copy
+import time
 
 # ======================================================================
 # ======================== MINIMAX & ALPHA-BETA ========================
 # ======================================================================
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
-# Šeit definējam visas nepieciešamās funkcijas Minimax un Alpha-Beta,
+# Minimax un Alpha-Beta funkcijas importējam no MiniMax.py un AlfaBeta.py,
 # lai AI varētu izvēlēties labāko gājienu (take vai split).
 # >>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>>
 
-# --------- Minimax Implementation --------- #
-def generate_moves_minimax(sequence):
-    """
-    Funkcija, kas ģenerē visus iespējamos gājienus (take, split2, split4),
-    kas pieejami dotajā stāvoklī (sequence).
-    """
-    moves = []
-    for i, val in enumerate(sequence):
-        # 'take'
-        moves.append(("take", i))
-        # ja skaitlis == 2, var 'split2'
-        if val == 2:
-            moves.append(("split2", i))
-        # ja skaitlis == 4, var 'split4'
-        elif val == 4:
-            moves.append(("split4", i))
-    return moves
-
-def apply_move_minimax(sequence, ai_score, player_score, move, is_ai_turn):
-    """
-    Funkcija, kas pielieto norādīto gājienu (take, split2, split4),
-    atjaunina AI un spēlētāja punktus un atgriež jauno stāvokli.
-    """
-    move_type, index = move
-    new_seq = copy.deepcopy(sequence)
-    new_ai = ai_score
-    new_player = player_score
-
-    val = new_seq[index]
-    if move_type == "take":
-        del new_seq[index]
-        if is_ai_turn:
-            new_ai += val
-        else:
-            new_player += val
-
-    elif move_type == "split2":
-        # 2 -> [1, 1], pretiniekam +1
-        del new_seq[index]
-        new_seq.insert(index, 1)
-        new_seq.insert(index + 1, 1)
-        if is_ai_turn:
-            new_player += 1
-        else:
-            new_ai += 1
-
-    elif move_type == "split4":
-        # 4 -> [2, 2], pretiniekam -1 (ne zem 0)
-        del new_seq[index]
-        new_seq.insert(index, 2)
-        new_seq.insert(index + 1, 2)
-        if is_ai_turn:
-            new_player = max(0, new_player - 1)
-        else:
-            new_ai = max(0, new_ai - 1)
-
-    return new_seq, new_ai, new_player
-
-def minimax(sequence, ai_score, player_score, depth, is_ai_turn):
-    """
-    Minimax algoritms ar noteiktu 'depth'.
-    Atgriež (ai_score - player_score) kā stāvokļa novērtējumu.
-    """
-    # Bāzes gadījums: ja dziļums = 0 vai nav gājienu, atgriež heuristiku
-    if depth == 0 or not sequence:
-        return ai_score - player_score
-
-    moves = generate_moves_minimax(sequence)
-
-    if is_ai_turn:
-        max_eval = float('-inf')
-        for move in moves:
-            new_seq, new_ai, new_pl = apply_move_minimax(sequence, ai_score, player_score, move, True)
-            eval_val = minimax(new_seq, new_ai, new_pl, depth - 1, False)
-            max_eval = max(max_eval, eval_val)
-        return max_eval
-    else:
-        min_eval = float('inf')
-        for move in moves:
-            new_seq, new_ai, new_pl = apply_move_minimax(sequence, ai_score, player_score, move, False)
-            eval_val = minimax(new_seq, new_ai, new_pl, depth - 1, True)
-            min_eval = min(min_eval, eval_val)
-        return min_eval
-
-def find_best_move_minimax(sequence, ai_score, player_score):
-    """
-    Funkcija, kas atrod labāko gājienu, izmantojot Minimax.
-    Ja sequence garums <= 7, tad dziļums = 4, citādi = 3.
-    """
-    depth = 4 if len(sequence) <= 7 else 3
-    best_value = float('-inf')
-    best_move = None
-
-    moves = generate_moves_minimax(sequence)
-    if not moves:
-        return None
-
-    for move in moves:
-        new_seq, new_ai, new_pl = apply_move_minimax(sequence, ai_score, player_score, move, True)
-        eval_val = minimax(new_seq, new_ai, new_pl, depth - 1, False)
-        if eval_val > best_value:
-            best_value = eval_val
-            best_move = move
-
-    return best_move
-
-def ai_move_minimax(sequence, ai_score, player_score):
-    """
-    Funkcija, kas ļauj AI izdarīt gājienu, izmantojot Minimax.
-    Atgriež jauno (sequence, ai_score, player_score).
-    """
-    move = find_best_move_minimax(sequence, ai_score, player_score)
-    if move is None:
-        return sequence, ai_score, player_score
-
-    new_seq, new_ai, new_pl = apply_move_minimax(sequence, ai_score, player_score, move, True)
-    return new_seq, new_ai, new_pl
-
-# --------- Alpha-Beta Implementation --------- #
-INF = float('inf')
-
-def generate_moves_ab(sequence):
-    """
-    Funkcija, kas ģenerē iespējamos gājienus (take, split2, split4)
-    Alpha-Beta algoritmam.
-    """
-    moves = []
-    for i, value in enumerate(sequence):
-        moves.append(("take", i, value))
-        if value == 2:
-            moves.append(("split2", i, value))
-        elif value == 4:
-            moves.append(("split4", i, value))
-    return moves
-
-def apply_move_ab(sequence, ai_score, human_score, current_turn_is_ai, move):
-    """
-    Pielieto gājienu (take, split2, split4) un atgriež jauno stāvokli,
-    jaunos punktus un nākamā spēlētāja karodziņu.
-    """
-    new_sequence = sequence.copy()
-    action, index, value = move
-
-    new_ai = ai_score
-    new_human = human_score
-
-    if action == "take":
-        new_sequence.pop(index)
-        if current_turn_is_ai:
-            new_ai += value
-        else:
-            new_human += value
-
-    elif action == "split2":
-        new_sequence[index:index+1] = [1, 1]
-        if current_turn_is_ai:
-            new_human += 1
-        else:
-            new_ai += 1
-
-    elif action == "split4":
-        new_sequence[index:index+1] = [2, 2]
-        if current_turn_is_ai:
-            new_human = max(0, new_human - 1)
-        else:
-            new_ai = max(0, new_ai - 1)
-
-    return new_sequence, new_ai, new_human, not current_turn_is_ai
-
-def alphabeta(sequence, ai_score, human_score, depth, alpha, beta, current_turn_is_ai):
-    """
-    Alpha-Beta algoritms, kas atgriež (ai_score - human_score).
-    """
-    moves = generate_moves_ab(sequence)
-    if depth == 0 or len(moves) == 0:
-        return ai_score - human_score
-
-    if current_turn_is_ai:
-        value = -INF
-        for move in moves:
-            new_seq, new_ai, new_human, new_turn = apply_move_ab(sequence, ai_score, human_score, True, move)
-            score = alphabeta(new_seq, new_ai, new_human, depth - 1, alpha, beta, new_turn)
-            value = max(value, score)
-            alpha = max(alpha, value)
-            if alpha >= beta:
-                break
-        return value
-    else:
-        value = INF
-        for move in moves:
-            new_seq, new_ai, new_human, new_turn = apply_move_ab(sequence, ai_score, human_score, False, move)
-            score = alphabeta(new_seq, new_ai, new_human, depth - 1, alpha, beta, new_turn)
-            value = min(value, score)
-            beta = min(beta, value)
-            if beta <= alpha:
-                break
-        return value
-
-def find_best_move_ab(sequence, ai_score, human_score, current_turn_is_ai=True):
-    """
-    Funkcija, kas atrod labāko gājienu, izmantojot Alpha-Beta.
-    """
-    depth = 4 if len(sequence) <= 7 else 3
-    best_move = None
-
-    if current_turn_is_ai:
-        best_value = -INF
-        possible_moves = generate_moves_ab(sequence)
-        if not possible_moves:
-            return None
-
-        for move in possible_moves:
-            new_seq, new_ai, new_human, new_turn = apply_move_ab(sequence, ai_score, human_score, True, move)
-            score = alphabeta(new_seq, new_ai, new_human, depth - 1, -INF, INF, new_turn)
-            if best_move is None or score > best_value:
-                best_value = score
-                best_move = move
-    else:
-        best_value = INF
-        possible_moves = generate_moves_ab(sequence)
-        if not possible_moves:
-            return None
-
-        for move in possible_moves:
-            new_seq, new_ai, new_human, new_turn = apply_move_ab(sequence, ai_score, human_score, False, move)
-            score = alphabeta(new_seq, new_ai, new_human, depth - 1, -INF, INF, new_turn)
-            if best_move is None or score < best_value:
-                best_value = score
-                best_move = move
-
-    return best_move
-
-def ai_move_alphabeta(sequence, ai_score, player_score):
-    """
-    Funkcija, kas ļauj AI izdarīt gājienu, izmantojot Alpha-Beta.
-    Atgriež jauno (sequence, ai_score, player_score).
-    """
-    move = find_best_move_ab(sequence, ai_score, player_score, current_turn_is_ai=True)
-    if move is None:
-        return sequence, ai_score, player_score
-
-    new_sequence, new_ai, new_human, _ = apply_move_ab(sequence, ai_score, player_score, True, move)
-    return new_sequence, new_ai, new_human
+# Abi algoritmi izmanto vienu negamax meklēšanas dzinēju (Engine.py):
+# MiniMax.py - bez nogriešanas / precīzs atrisinājums, AlfaBeta.py - Alpha-Beta.
+# Trešais algoritms - Monte Carlo koka meklēšana (MCTS.py).
+# Gājieni ir kanoniskā formā (action, value), piem. ("take", 4).
+from MiniMax import ai_move as ai_move_minimax
+from MiniMax import find_best_move as find_best_move_minimax
+from AlfaBeta import ai_move as ai_move_alphabeta
+from AlfaBeta import find_best_move as find_best_move_alphabeta
+from AlfaBeta import TIME_BUDGET
+import MCTS
+from GameRecord import find_move, open_default as open_game_recorder
+from GameState import make_state, apply_sequence_move
+from ProfileStore import open_default as open_profile_store
+from SearchStats import SearchStats
 
 # ======================================================================
 # ======================== SPĒLES LOĢIKA (KONSOLE) =====================
 # ======================================================================
 
-def generate_sequence(length):
+def generate_sequence(length, rng=random):
     """
     Funkcija, kas ģenerē nejaušu skaitļu virkni (no [1, 2, 3, 4]) garumā 'length'.
+    'rng' ļauj izmantot savu random.Random (piem., ar fiksētu seed).
     """
-    return [random.choice([1, 2, 3, 4]) for _ in range(length)]
+    return [rng.choice([1, 2, 3, 4]) for _ in range(length)]
 
 def ai_move(sequence, ai_score, player_score, chosen_algo):
     """
-    Funkcija, kas atkarībā no izvēlētā algoritma (Minimax vai Alpha-Beta),
+    Funkcija, kas atkarībā no izvēlētā algoritma (Minimax, Alpha-Beta vai MCTS),
     veic AI gājienu. Ja nav izvēlēts, veic nejaušu gājienu.
     """
     if not sequence:
@@ -276,6 +50,8 @@ def ai_move(sequence, ai_score, player_score, chosen_algo):
         return ai_move_minimax(sequence, ai_score, player_score)
     elif chosen_algo == "Alpha-Beta":
         return ai_move_alphabeta(sequence, ai_score, player_score)
+    elif chosen_algo == "MCTS":
+        return MCTS.ai_move(sequence, ai_score, player_score)
     else:
         chosen_value = random.choice(sequence)
         sequence.remove(chosen_value)
@@ -369,13 +145,16 @@ def main():
     print("Choose the AI algorithm:")
     print("1) Minimax")
     print("2) Alpha-Beta")
-    alg_choice = input("Enter 1 or 2 (or press Enter for a random AI move): ").strip()
+    print("3) MCTS")
+    alg_choice = input("Enter 1, 2 or 3 (or press Enter for a random AI move): ").strip()
 
     chosen_algo = None
     if alg_choice == "1":
         chosen_algo = "Minimax"
     elif alg_choice == "2":
         chosen_algo = "Alpha-Beta"
+    elif alg_choice == "3":
+        chosen_algo = "MCTS"
 
     while True:
         length_str = input("Enter sequence length (15 to 20). Press Enter for 15: ").strip()
@@ -397,7 +176,13 @@ def main():
 
     ai_name = "Computer"
     current_level = 1
-    best_level = 0
+    # Labākais līmenis un statistika saglabājas starp palaišanām (ProfileStore.py)
+    store = open_profile_store()
+    best_level = store.profile(player_name).best_level if store else 0
+    if best_level > 0:
+        print(f"Welcome back, {player_name}! Your best level so far: {best_level}")
+    # Katras spēles gājieni tiek pierakstīti games.jsonl (GameRecord.py)
+    recorder = open_game_recorder()
 
     while True:
         print(f"\n=== Starting game at level {current_level} ===")
@@ -405,25 +190,48 @@ def main():
         player_score = 0
         ai_score = 0
         player_turn_flag = (first_mover == "player")
+        ai_moves = 0
+        ai_think_time = 0.0
+        if recorder:
+            recorder.start_game(sequence, player_name, chosen_algo, current_level, first_mover)
 
         while sequence:
             print_scores(player_name, player_score, ai_name, ai_score)
+            # Abas gājienu funkcijas var mainīt virkni uz vietas
+            before = list(sequence)
             if player_turn_flag:
                 print(f"\n{player_name}'s turn:")
                 sequence, player_score, ai_score = player_turn(sequence, player_score, ai_score)
+                elapsed = None
             else:
                 print(f"\n{ai_name}'s turn...")
+                start = time.perf_counter()
                 sequence, ai_score, player_score = ai_move(sequence, ai_score, player_score, chosen_algo)
+                elapsed = time.perf_counter() - start
+                ai_think_time += elapsed
+                ai_moves += 1
+            if recorder:
+                move, index = find_move(before, sequence)
+                recorder.record_move("player" if player_turn_flag else "ai", move, index,
+                                     player_score, ai_score,
+                                     elapsed * 1000 if elapsed is not None else None)
             player_turn_flag = not player_turn_flag
 
         # Kad virkne ir tukša, nosakām uzvarētāju (vai neizšķirtu)
         print("\nThe sequence is empty!")
         print_scores(player_name, player_score, ai_name, ai_score)
 
+        won_level = current_level if player_score > ai_score else 0
+        if recorder:
+            result = "player" if player_score > ai_score else "ai" if ai_score > player_score else "draw"
+            recorder.end_game(player_score, ai_score, result)
+        if store:
+            best_level = store.record_game(player_name, won_level, ai_moves, ai_think_time).best_level
+        else:
+            best_level = max(best_level, won_level)
+
         if player_score > ai_score:
             print(f"\nCongratulations, {player_name} has won this round!")
-            if current_level > best_level:
-                best_level = current_level
             print(f"Your best level so far: {best_level}")
             ans = input("Do you want to continue to the next level? (y/n): ").strip().lower()
             if ans == "y":
@@ -451,5 +259,216 @@ def main():
                 print("Thank you for playing!")
                 break
 
+    if store:
+        store.close()
+    if recorder:
+        recorder.close()
+
+# ======================================================================
+# ================== AI PRET AI (BEZ INTERFEISA, PAKETĒ) ===============
+# ======================================================================
+
+ALGORITHMS = ("Minimax", "Alpha-Beta", "MCTS", "Random")
+
+def batch_move(algo, sequence, own_score, opp_score, depth, rng, stats=None):
+    """
+    Veic gājienu pusei, kurai ir 'own_score' punkti (noteikumi abām pusēm ir vienādi).
+    depth=None: Minimax - precīzs atrisinājums, Alpha-Beta - ar laika budžetu.
+    MCTS 'depth' neizmanto; tas katru gājienu meklē ar jaunu koku un 'rng',
+    lai spēle būtu atkārtojama pēc seed.
+    'stats' (SearchStats) saņem meklēšanas atskaiti.
+    Atgriež (sequence, own_score, opp_score).
+    """
+    if algo == "Minimax":
+        move = find_best_move_minimax(sequence, own_score, opp_score,
+                                      exact=depth is None, depth=depth, stats=stats)
+    elif algo == "Alpha-Beta":
+        time_budget = TIME_BUDGET if depth is None else None
+        move = find_best_move_alphabeta(sequence, own_score, opp_score,
+                                        time_budget=time_budget, depth=depth, stats=stats)
+    elif algo == "MCTS":
+        move = MCTS.find_best_move(sequence, own_score, opp_score,
+                                   engine=MCTS.MCTS(rng=rng), stats=stats)
+    else:
+        # Nejaušs gājiens no visiem atļautajiem (arī split)
+        if stats is not None:
+            stats.source = "random"
+        move = rng.choice(make_state(sequence, own_score, opp_score).moves())
+    return apply_sequence_move(sequence, own_score, opp_score, move)
+
+def play_batch_game(sequence, algo_a, algo_b, a_first, depth, rng,
+                    search_log=None, game_index=0):
+    """
+    Izspēlē vienu spēli A pret B bez ievades.
+    Atgriež vārdnīcu ar rezultātu, katras puses domāšanas laiku un mezglu skaitu.
+    Ja padots 'search_log' (fails), katra gājiena meklēšanas atskaiti ieraksta kā JSON rindu.
+    """
+    board = list(sequence)
+    scores = {"a": 0, "b": 0}
+    think = {"a": 0.0, "b": 0.0}
+    slowest = {"a": 0.0, "b": 0.0}
+    moves = {"a": 0, "b": 0}
+    nodes = {"a": 0, "b": 0}
+    algos = {"a": algo_a, "b": algo_b}
+    side, other = ("a", "b") if a_first else ("b", "a")
+
+    while sequence:
+        stats = SearchStats()
+        start = time.perf_counter()
+        sequence, scores[side], scores[other] = batch_move(
+            algos[side], sequence, scores[side], scores[other], depth, rng, stats)
+        elapsed = time.perf_counter() - start
+        stats.elapsed = elapsed
+        think[side] += elapsed
+        slowest[side] = max(slowest[side], elapsed)
+        nodes[side] += stats.total_nodes
+        if search_log is not None:
+            record = {"game": game_index, "ply": moves["a"] + moves["b"],
+                      "side": side, "algo": algos[side]}
+            record.update(stats.as_dict())
+            search_log.write(json.dumps(record) + "\n")
+        moves[side] += 1
+        side, other = other, side
+
+    if scores["a"] > scores["b"]:
+        result = "a"
+    elif scores["b"] > scores["a"]:
+        result = "b"
+    else:
+        result = "draw"
+    return {
+        "board": board,
+        "first": "a" if a_first else "b",
+        "score_a": scores["a"],
+        "score_b": scores["b"],
+        "result": result,
+        "moves_a": moves["a"],
+        "moves_b": moves["b"],
+        "think_a": think["a"],
+        "think_b": think["b"],
+        "max_move_a": slowest["a"],
+        "max_move_b": slowest["b"],
+        "nodes_a": nodes["a"],
+        "nodes_b": nodes["b"],
+    }
+
+def new_batch_summary(args):
+    return {
+        "algo_a": args.algo_a,
+        "algo_b": args.algo_b,
+        "depth": args.depth,
+        "seed": args.seed,
+        "games": 0,
+        "wins_a": 0,
+        "wins_b": 0,
+        "draws": 0,
+        "moves_a": 0,
+        "moves_b": 0,
+        "score_diff_sum": 0,
+        "think_a": 0.0,
+        "think_b": 0.0,
+        "max_move_a": 0.0,
+        "max_move_b": 0.0,
+        "nodes_a": 0,
+        "nodes_b": 0,
+    }
+
+def update_batch_summary(summary, game):
+    """
+    Pieskaita vienas spēles rezultātu kopsavilkumam (atmiņa nav atkarīga no spēļu skaita).
+    """
+    summary["games"] += 1
+    if game["result"] == "a":
+        summary["wins_a"] += 1
+    elif game["result"] == "b":
+        summary["wins_b"] += 1
+    else:
+        summary["draws"] += 1
+    summary["moves_a"] += game["moves_a"]
+    summary["moves_b"] += game["moves_b"]
+    summary["score_diff_sum"] += game["score_a"] - game["score_b"]
+    summary["think_a"] += game["think_a"]
+    summary["think_b"] += game["think_b"]
+    summary["max_move_a"] = max(summary["max_move_a"], game["max_move_a"])
+    summary["max_move_b"] = max(summary["max_move_b"], game["max_move_b"])
+    summary["nodes_a"] += game["nodes_a"]
+    summary["nodes_b"] += game["nodes_b"]
+
+def finish_batch_summary(summary, elapsed):
+    summary["elapsed"] = elapsed
+    summary["games_per_sec"] = summary["games"] / elapsed if elapsed > 0 else 0.0
+    summary["avg_score_diff"] = summary.pop("score_diff_sum") / (summary["games"] or 1)
+    summary["avg_move_a"] = summary["think_a"] / (summary["moves_a"] or 1)
+    summary["avg_move_b"] = summary["think_b"] / (summary["moves_b"] or 1)
+    return summary
+
+def run_batch(args, out=None, search_log=None):
+    """
+    Izspēlē args.games spēles un straumē katras spēles rezultātu kā JSON rindu uz 'out'
+    (un, ja padots, katra gājiena meklēšanas atskaiti uz 'search_log').
+    Spēles i virkne un nejaušie gājieni ir atkarīgi tikai no (args.seed, i).
+    Atgriež kopsavilkumu.
+    """
+    summary = new_batch_summary(args)
+    started = time.perf_counter()
+    for i in range(args.games):
+        rng = random.Random(f"{args.seed}:{i}")
+        length = rng.randint(args.min_length, args.max_length)
+        sequence = generate_sequence(length, rng)
+        if args.first == "alternate":
+            a_first = i % 2 == 0
+        else:
+            a_first = args.first == "a"
+
+        game = {"game": i}
+        game.update(play_batch_game(sequence, args.algo_a, args.algo_b, a_first, args.depth, rng,
+                                    search_log, i))
+        update_batch_summary(summary, game)
+        if out is not None:
+            out.write(json.dumps(game) + "\n")
+    return finish_batch_summary(summary, time.perf_counter() - started)
+
+def parse_batch_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Play AI-vs-AI games without any interface and report statistics.")
+    parser.add_argument("--games", type=int, required=True, help="number of games to play")
+    parser.add_argument("--algo-a", choices=ALGORITHMS, default="Alpha-Beta")
+    parser.add_argument("--algo-b", choices=ALGORITHMS, default="Minimax")
+    parser.add_argument("--depth", type=int, default=None,
+                        help="fixed search depth (default: exact Minimax, timed Alpha-Beta)")
+    parser.add_argument("--first", choices=("a", "b", "alternate"), default="alternate",
+                        help="who moves first in each game")
+    parser.add_argument("--min-length", type=int, default=15)
+    parser.add_argument("--max-length", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None,
+                        help="write one JSON line per game to this file ('-' for stdout)")
+    parser.add_argument("--search-log", default=None,
+                        help="write one JSON search report per move to this file")
+    args = parser.parse_args(argv)
+    if args.games < 0 or not 1 <= args.min_length <= args.max_length:
+        parser.error("invalid --games or --min-length/--max-length")
+    return args
+
+def batch_main(argv=None):
+    args = parse_batch_args(argv)
+    search_log = open(args.search_log, "w") if args.search_log else None
+    try:
+        if args.output == "-":
+            summary = run_batch(args, sys.stdout, search_log)
+        elif args.output:
+            with open(args.output, "w") as out:
+                summary = run_batch(args, out, search_log)
+        else:
+            summary = run_batch(args, None, search_log)
+    finally:
+        if search_log is not None:
+            search_log.close()
+    print(json.dumps(summary, indent=2), file=sys.stderr if args.output == "-" else sys.stdout)
+
 if __name__ == "__main__":
-    main()
+    # Bez argumentiem - interaktīvā spēle; ar argumentiem (piem., --games 1000) - paketes režīms
+    if len(sys.argv) > 1:
+        batch_main(sys.argv[1:])
+    else:
+        main()
@@ -1,107 +1,51 @@
-import copy
-
-def generate_moves(sequence):
-    moves = []
-    for i, val in enumerate(sequence):
-        # Ņemt skaitli
-        moves.append(("take", i))
-        # Dalīt 2
-        if val == 2:
-            moves.append(("split2", i))
-        # Dalīt 4
-        elif val == 4:
-            moves.append(("split4", i))
-    return moves
-
-def apply_move(sequence, ai_score, player_score, move, is_ai_turn):
-    move_type, index = move
-    seq = copy.deepcopy(sequence)
-    ai = ai_score
-    player = player_score
-
-    val = seq[index]
-    if move_type == "take":
-        del seq[index]
-        if is_ai_turn:
-            ai += val
-        else:
-            player += val
-
-    elif move_type == "split2":
-        del seq[index]
-        seq.insert(index, 1)
-        seq.insert(index + 1, 1)
-        if is_ai_turn:
-            player += 1
-        else:
-            ai += 1
-
-    elif move_type == "split4":
-        del seq[index]
-        seq.insert(index, 2)
-        seq.insert(index + 1, 2)
-        if is_ai_turn:
-            player = max(0, player - 1)
-        else:
-            ai = max(0, ai - 1)
-
-    return seq, ai, player
-
-def minimax(sequence, ai_score, player_score, depth, is_ai_turn):
-    if depth == 0 or not sequence:
-        return ai_score - player_score
-
-    moves = generate_moves(sequence)
-
-    if is_ai_turn:
-        max_eval = float('-inf')
-        for move in moves:
-            new_seq, new_ai, new_player = apply_move(sequence, ai_score, player_score, move, is_ai_turn=True)
-            eval = minimax(new_seq, new_ai, new_player, depth - 1, is_ai_turn=False)
-            max_eval = max(max_eval, eval)
-        return max_eval
-    else:
-        min_eval = float('inf')
-        for move in moves:
-            new_seq, new_ai, new_player = apply_move(sequence, ai_score, player_score, move, is_ai_turn=False)
-            eval = minimax(new_seq, new_ai, new_player, depth - 1, is_ai_turn=True)
-            min_eval = min(min_eval, eval)
-        return min_eval
-
-def find_best_move(sequence, ai_score, player_score):
-    depth = 4 if len(sequence) <= 7 else 3
-    best_value = float('-inf')
-    best_move = None
-
-    for move in generate_moves(sequence):
-        new_seq, new_ai, new_player = apply_move(sequence, ai_score, player_score, move, is_ai_turn=True)
-        eval = minimax(new_seq, new_ai, new_player, depth - 1, is_ai_turn=False)
-        if eval > best_value:
-            best_value = eval
-            best_move = move
-
-    return best_move
-
-def ai_move(sequence, ai_score):
-    move = find_best_move(sequence, ai_score, 0)
+import time
+
+from Engine import PRUNING_NONE, SOLVE_CACHE, best_move, solve
+from GameState import make_state, apply_sequence_move
+from OpeningBook import OPENING_BOOK
+from Tablebase import TABLEBASE
+
+def find_best_move(sequence, ai_score, player_score, exact=True, ai_turn=True,
+                   tablebase=TABLEBASE, depth=None, stats=None, book=OPENING_BOOK, cancel=None):
+    # Atgriež kanonisku gājienu (action, value) vai None, ja virkne ir tukša;
+    # 'cancel' (threading.Event) pārtrauc meklēšanu (Engine.solve() / Engine.best_move())
+    state = make_state(sequence, ai_score, player_score, ai_turn)
+    if exact:
+        # Atklātņu grāmata (pirmais gājiens) un galotņu tabula atbild uzreiz, ja stāvoklis tajās ir
+        if book is not None:
+            hit = book.probe(state)
+            if hit is not None:
+                if stats is not None:
+                    stats.source = "book"
+                return hit[1]
+        if tablebase is not None:
+            hit = tablebase.probe(state)
+            if hit is not None:
+                if stats is not None:
+                    stats.source = "tablebase"
+                return hit[1]
+
+        # Precīzs atrisinājums līdz spēles beigām (kešs SOLVE_CACHE saglabājas starp spēlēm)
+        _, move = solve(state, SOLVE_CACHE, stats, cancel=cancel)
+        if stats is not None:
+            stats.source = "solve"
+            # Līdz spēles beigām: dziļākais atrisinātais stāvoklis + gala stāvoklis aiz tā
+            stats.depth = stats.max_ply + 1 if stats.nodes else 0
+        return move
+
+    # Klasiskais Minimax ar fiksētu dziļumu (negamax bez nogriešanas)
+    if depth is None:
+        depth = 4 if len(sequence) <= 7 else 3
+    return best_move(state, PRUNING_NONE, depth, stats=stats, cancel=cancel)
+
+def ai_move(sequence, ai_score, player_score, exact=True, stats=None):
+    # 'stats' (SearchStats) pēc gājiena satur meklēšanas atskaiti
+    start = time.perf_counter()
+    move = find_best_move(sequence, ai_score, player_score, exact, stats=stats)
+    if stats is not None:
+        stats.elapsed = time.perf_counter() - start
     if move is None:
-        return sequence, ai_score
-
-    move_type, index = move
-    val = sequence[index]
-
-    if move_type == "take":
-        sequence.pop(index)
-        ai_score += val
-    elif move_type == "split2":
-        sequence.pop(index)
-        sequence.insert(index, 1)
-        sequence.insert(index + 1, 1)
-        # cilvēkam +1, ja integrējam — nodod spēles funkcijai
-    elif move_type == "split4":
-        sequence.pop(index)
-        sequence.insert(index, 2)
-        sequence.insert(index + 1, 2)
-        # cilvēkam -1, ja integrējam — nodod spēles funkcijai
+        return sequence, ai_score, player_score
 
-    return sequence, ai_score
+    # Atgriež (new_sequence, new_ai_score, new_player_score)
+    return apply_sequence_move(sequence, ai_score, player_score, move, ai_turn=True)
@@ -0,0 +1,54 @@
+"""
+Gājienu kārtošana Alpha-Beta meklēšanai.
+
+Jo agrāk tiek izmeklēts labākais gājiens, jo vairāk zaru var nogriezt.
+Secība katrā mezglā:
+1. transpozīciju tabulas / iepriekšējās iterācijas labākais gājiens;
+2. 'take' gājieni, sākot ar lielāko skaitli;
+3. split gājieni: vispirms "killer" gājieni šajā dziļumā,
+   tad pēc vēstures heiristikas (cik bieži gājiens izraisīja nogriešanu).
+"""
+
+
+class MoveOrdering:
+    def __init__(self, killers_per_ply=2):
+        self.killers_per_ply = killers_per_ply
+        # ply -> pēdējie gājieni, kas šajā dziļumā izraisīja nogriešanu
+        self.killers = {}
+        # gājiens -> uzkrātais vēstures vērtējums
+        self.history = {}
+
+    def order(self, moves, ply, first_move=None):
+        """
+        Atgriež gājienus sakārtotus izmeklēšanas secībā.
+        """
+        takes = [move for move in moves if move[0] == "take"]
+        takes.sort(key=lambda move: -move[1])
+
+        killers = self.killers.get(ply, ())
+        splits = [move for move in moves if move[0] != "take"]
+        splits.sort(key=lambda move: (move not in killers, -self.history.get(move, 0)))
+
+        ordered = takes + splits
+        if first_move is not None and first_move in ordered:
+            ordered.remove(first_move)
+            ordered.insert(0, first_move)
+        return ordered
+
+    def record_cutoff(self, move, ply, depth):
+        """
+        Atzīmē gājienu, kas izraisīja nogriešanu. 'take' gājieni jau ir
+        sakārtoti pēc vērtības, tāpēc killer/history uzskaita tikai split gājienus.
+        """
+        if move[0] == "take":
+            return
+        killers = self.killers.setdefault(ply, [])
+        if move in killers:
+            killers.remove(move)
+        killers.insert(0, move)
+        del killers[self.killers_per_ply:]
+        self.history[move] = self.history.get(move, 0) + depth * depth
+
+    def clear(self):
+        self.killers.clear()
+        self.history.clear()
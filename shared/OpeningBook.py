@@ -0,0 +1,185 @@
+"""
+Atklātņu grāmata: precīzi labākie AI pirmie gājieni visām sākuma virknēm
+garumā MIN_LENGTH..MAX_LENGTH.
+
+Sākuma virkni nosaka tikai skaitļu 1..4 skaiti, tāpēc garumam n ir
+(n + 1)(n + 2)(n + 3) / 6 dažādu sākuma stāvokļu. Grāmatā ir:
+- katrs sākuma stāvoklis, kad AI sāk pirmais (punkti 0 : 0);
+- katrs stāvoklis pēc cilvēka pirmā gājiena, kad sāk cilvēks.
+
+Pirmais gājiens uz garas virknes ir dārgākā meklēšana. Grāmata ir daudz
+mazāka par galotņu tabulu (Tablebase.py), tāpēc to var izplatīt kopā ar
+spēli; vērtības ģenerē ar to pašu retrogrādo analīzi.
+
+Faila formāts: galvene HEADER (MAGIC, FORMAT_VERSION, min_length, max_length,
+ierakstu skaits, CRC32), tad ieraksti RECORD pēc atslēgas augošā secībā:
+GameState.canonical_key() kā 6 baiti un int16 (gain * 8 + gājiena kods,
+tāpat kā Tablebase). Ierakstu meklē ar bināro meklēšanu pa baitiem, bez
+ielādes vārdnīcā.
+
+Ģenerēšana: python OpeningBook.py [--min-length N] [--max-length N] [--output PATH]
+"""
+
+import argparse
+import os
+import struct
+import time
+import zlib
+
+from GameState import GameState
+from Tablebase import MOVES, NO_MOVE, TABLEBASE, generate as generate_tablebase
+
+MIN_LENGTH = 15
+MAX_LENGTH = 20
+
+MAGIC = b"GOBK"
+FORMAT_VERSION = 1
+# magic, version, min_length, max_length, ierakstu skaits, CRC32 no ierakstiem
+HEADER = struct.Struct("<4sHBBII")
+# canonical_key (c1, c2, c3, c4, mover, opponent) + gain * 8 + gājiena kods
+RECORD = struct.Struct("<6Bh")
+KEY_SIZE = 6
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "openings.bin")
+
+
+def opening_positions(min_length=MIN_LENGTH, max_length=MAX_LENGTH):
+    """
+    Visi stāvokļi, kuros AI izdara savu pirmo gājienu (ar atkārtojumiem).
+    """
+    for n in range(min_length, max_length + 1):
+        for c4 in range(n + 1):
+            for c3 in range(n + 1 - c4):
+                for c2 in range(n + 1 - c4 - c3):
+                    counts = [0, n - c2 - c3 - c4, c2, c3, c4]
+                    # AI sāk pirmais
+                    yield GameState(list(counts), 0, 0, True)
+                    # Sāk cilvēks: AI pirmais gājiens ir pēc jebkura cilvēka gājiena
+                    human = GameState(list(counts), 0, 0, False)
+                    for move in human.moves():
+                        child = human.copy()
+                        child.make(move)
+                        yield child
+
+
+class OpeningBook:
+    """
+    data - ieraksti (bytes) pēc atslēgas augošā secībā.
+    """
+
+    def __init__(self, data, min_length=MIN_LENGTH, max_length=MAX_LENGTH):
+        if len(data) % RECORD.size:
+            raise ValueError("opening book data is not a whole number of records")
+        self.data = data
+        self.count = len(data) // RECORD.size
+        self.min_length = min_length
+        self.max_length = max_length
+
+    def __len__(self):
+        return self.count
+
+    def probe(self, state):
+        """
+        Atgriež (gain, move) tāpat kā Tablebase.probe() vai None, ja stāvokļa grāmatā nav.
+        """
+        key = state.canonical_key()
+        if max(key) > 255:
+            return None
+        key = bytes(key)
+        data = self.data
+        size = RECORD.size
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = mid * size
+            if data[offset:offset + KEY_SIZE] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        offset = lo * size
+        if lo == self.count or data[offset:offset + KEY_SIZE] != key:
+            return None
+        entry = RECORD.unpack_from(data, offset)[KEY_SIZE]
+        code = entry & 7
+        return entry >> 3, (MOVES[code] if code != NO_MOVE else None)
+
+    def save(self, path=DEFAULT_PATH):
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.min_length, self.max_length,
+                                self.count, zlib.crc32(self.data)))
+            f.write(self.data)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH):
+        """
+        Nolasa grāmatu. ValueError, ja fails nav šīs versijas grāmata vai ir bojāts.
+        """
+        with open(path, "rb") as f:
+            raw = f.read()
+        if len(raw) < HEADER.size:
+            raise ValueError(f"{path}: file too short for an opening book header")
+        magic, version, min_length, max_length, count, checksum = HEADER.unpack_from(raw)
+        if magic != MAGIC:
+            raise ValueError(f"{path}: not an opening book file")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path}: opening book version {version}, expected {FORMAT_VERSION}")
+        data = raw[HEADER.size:]
+        if len(data) != count * RECORD.size:
+            raise ValueError(f"{path}: truncated opening book")
+        if zlib.crc32(data) != checksum:
+            raise ValueError(f"{path}: opening book checksum mismatch")
+        return cls(data, min_length, max_length)
+
+
+def generate(min_length=MIN_LENGTH, max_length=MAX_LENGTH, tablebase=None):
+    """
+    Atrisina visus atklātņu stāvokļus ar galotņu tabulu: 'tablebase', ja tā
+    aptver max_length skaitļus, citādi ģenerē jaunu.
+    """
+    if tablebase is None or tablebase.max_numbers < max_length:
+        tablebase = generate_tablebase(max_length)
+    entries = {}
+    for state in opening_positions(min_length, max_length):
+        key = state.canonical_key()
+        if key not in entries:
+            entries[key] = tablebase.entries[tablebase.index(*key)]
+    data = b"".join(RECORD.pack(*key, entries[key]) for key in sorted(entries))
+    return OpeningBook(data, min_length, max_length)
+
+
+def load_default(path=DEFAULT_PATH):
+    """
+    Nolasa ģenerēto grāmatu, ja tā ir; citādi None (dzinēji tad meklē paši).
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        return OpeningBook.load(path)
+    except (OSError, ValueError):
+        return None
+
+
+# Kopīgā grāmata abiem dzinējiem (None, ja openings.bin nav ģenerēts)
+OPENING_BOOK = load_default()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the opening book.")
+    parser.add_argument("--min-length", type=int, default=MIN_LENGTH,
+                        help="shortest starting sequence in the book")
+    parser.add_argument("--max-length", type=int, default=MAX_LENGTH,
+                        help="longest starting sequence in the book")
+    parser.add_argument("--output", default=DEFAULT_PATH, help="output file")
+    args = parser.parse_args()
+    if not 1 <= args.min_length <= args.max_length <= 255:
+        parser.error("lengths must satisfy 1 <= min-length <= max-length <= 255")
+
+    start = time.perf_counter()
+    book = generate(args.min_length, args.max_length, TABLEBASE)
+    book.save(args.output)
+    print(f"{len(book)} positions written to {args.output} "
+          f"in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Paralēlā saknes meklēšana (root splitting) Alpha-Beta dzinējam.
+
+Saknes gājienus sadala starp ProcessPoolExecutor procesiem, tāpēc meklēšanu
+neierobežo GIL. Procesi dala kopīgu apakšējo robežu (multiprocessing.Value):
+katru gājienu sāk meklēt ar alpha = robeža - 1, un, atradis labāku vērtību,
+process robežu paaugstina, tāpēc vēlāk sākti gājieni tiek nogriezti vairāk.
+
+Novērtējums ir vesels skaitlis, tāpēc ar alpha = robeža - 1 katram gājienam,
+kas robežu sasniedz, vērtība ir precīza. Rezultātu apvieno deterministiski:
+lielākā vērtība, vienādu vērtību gadījumā - agrākais gājiens saknes secībā,
+neatkarīgi no tā, kurš process pabeidza pirmais.
+"""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from Engine import INF, PRUNING_ALPHABETA, PRUNING_NONE, Search, SearchTimeout
+from GameState import GameState
+from MoveOrdering import MoveOrdering
+from SearchStats import SearchStats
+from TranspositionTable import TranspositionTable
+
+# Darba procesa globālie objekti (iestata _init_worker)
+_bound = None
+_tt_size = 0
+
+
+def _init_worker(bound, tt_size):
+    global _bound, _tt_size
+    _bound = bound
+    _tt_size = tt_size
+
+
+def _search_move(key, move, depth, pruning, time_left):
+    """
+    Darba procesā izmeklē vienu saknes gājienu stāvoklim ar atslēgu GameState.key().
+    Atgriež (score, SearchStats) vai None, ja beidzās laiks.
+    """
+    counts = [0, key[0], key[1], key[2], key[3]]
+    state = GameState(counts, key[4], key[5], key[6])
+    stats = SearchStats()
+    deadline = time.perf_counter() + time_left if time_left is not None else None
+    # Katram gājienam sava tabula: rezultāts nav atkarīgs no tā, kurš process
+    # iepriekš izmeklēja kuru gājienu
+    tt = TranspositionTable(max_size=_tt_size) if _tt_size else None
+    search = Search(pruning, tt, MoveOrdering(), stats, deadline)
+
+    alpha = _bound.value - 1
+    state.make(move)
+    try:
+        score = -search.negamax(state, depth - 1, -INF, -alpha)
+    except SearchTimeout:
+        return None
+
+    with _bound.get_lock():
+        if score > _bound.value:
+            _bound.value = score
+    return score, stats
+
+
+class RootParallelSearch:
+    """
+    Procesu kopa paralēlai saknes meklēšanai; lieto ar 'with' vai jāaizver ar close().
+
+    workers - procesu skaits (noklusēti os.cpu_count()); vairāk par saknes
+              gājienu skaitu (ne vairāk kā 6) nav jēgas;
+    tt_size - transpozīciju tabulas izmērs viena gājiena meklēšanai (0 - bez tabulas).
+    """
+
+    def __init__(self, workers=None, tt_size=100000):
+        self.bound = multiprocessing.Value("d", -INF)
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(self.bound, tt_size))
+
+    def search_root(self, state, depth, pruning=PRUNING_ALPHABETA, first_move=None,
+                    time_left=None, stats=None):
+        """
+        Izmeklē visus saknes gājienus paralēli ar dziļumu 'depth'.
+        Atgriež (best_move, best_value) no gājiena izdarītāja viedokļa;
+        SearchTimeout, ja kāds gājiens netika pabeigts 'time_left' sekundēs.
+        """
+        if pruning == PRUNING_NONE:
+            raise ValueError("Root-parallel search needs alpha-beta pruning")
+        moves = MoveOrdering().order(state.moves(), 0, first_move)
+        with self.bound.get_lock():
+            self.bound.value = -INF
+
+        key = state.key()
+        futures = [self.executor.submit(_search_move, key, move, depth, pruning, time_left)
+                   for move in moves]
+        # Gaidām visus, lai neviens process nemainītu robežu nākamajā meklēšanā
+        results = [future.result() for future in futures]
+        if stats is not None:
+            stats.record_node(0)
+        if any(result is None for result in results):
+            raise SearchTimeout
+
+        best_move = None
+        best_value = -INF
+        for move, (score, move_stats) in zip(moves, results):
+            if stats is not None:
+                stats.merge(move_stats)
+            if best_move is None or score > best_value:
+                best_value = score
+                best_move = move
+        return best_move, best_value
+
+    def best_move(self, state, pruning=PRUNING_ALPHABETA, depth=3, time_budget=None,
+                  stats=None):
+        """
+        Tas pats, kas Engine.best_move(), bet saknes gājienus meklē paralēli.
+        Ar time_budget (sekundēs) izmanto iteratīvo padziļināšanu.
+        """
+        if state.is_terminal():
+            return None
+        if stats is not None:
+            stats.source = f"{pruning}-parallel"
+        if time_budget is None:
+            move, _ = self.search_root(state, depth, pruning, stats=stats)
+            if stats is not None:
+                stats.depth = depth
+            return move
+
+        deadline = time.perf_counter() + time_budget
+        best_move = None
+        for depth in range(1, state.max_plies() + 1):
+            # Pirmo iterāciju pabeidzam vienmēr, lai būtu ko atgriezt
+            time_left = deadline - time.perf_counter() if depth > 1 else None
+            try:
+                best_move, _ = self.search_root(state, depth, pruning, best_move,
+                                                time_left, stats)
+            except SearchTimeout:
+                break
+            if stats is not None:
+                stats.depth = depth
+            if time.perf_counter() >= deadline:
+                break
+        return best_move
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,115 @@
+"""
+Domāšana pretinieka laikā (pondering).
+
+Kamēr cilvēks domā, fona pavediens izmeklē stāvokļus pēc viņa ticamākajiem
+gājieniem un saglabā AI atbildes kešā. Ja cilvēka gājiens sakrīt ar kādu no
+tiem, AI atbilde jau ir gatava un meklēšana nav vajadzīga.
+
+Ticamākie gājieni ir tie, kas cilvēkam dod lielāko tūlītējo ieguvumu
+(paņemt lielāko skaitli, tad split4, tad split2). Katru stāvokli meklē ar
+to pašu dzinēju un iestatījumiem kā parastu AI gājienu, tāpēc iepriekš
+atrastā atbilde ir tāda pati, kādu AI atrastu pats.
+
+Domāšanu pārtrauc cancel() (threading.Event): meklēšana beidzas pie
+nākamā mezgla, un nepabeigtais rezultāts netiek saglabāts. Alpha-Beta
+domāšanai izmanto savu transpozīciju tabulu, lai netraucētu AI pavedienam.
+"""
+
+import threading
+import time
+
+import AlfaBeta
+import MiniMax
+from Engine import SearchTimeout
+from GameState import make_state, apply_sequence_move
+from SearchStats import SearchStats
+from TranspositionTable import TranspositionTable
+
+# Algoritmi, kuriem domāšana pretinieka laikā ir iespējama
+PONDER_ALGOS = ("Minimax", "Alpha-Beta")
+
+
+def likely_replies(state):
+    """
+    Gājiena izdarītāja gājieni, sakārtoti pēc tūlītējā ieguvuma (lielākais pirmais).
+    """
+    def gain(move):
+        action, value = move
+        if action == "take":
+            return value
+        return 1 if action == "split4" else -1
+    return sorted(state.moves(), key=gain, reverse=True)
+
+
+def search(algo, sequence, ai_score, player_score, stats, cancel, tt=None):
+    """
+    AI gājiens ar algoritmu 'algo' tāpat kā Main.ai_move(), bet atceļams.
+    """
+    if algo == "Minimax":
+        return MiniMax.find_best_move(sequence, ai_score, player_score, stats=stats,
+                                      cancel=cancel)
+    return AlfaBeta.find_best_move(sequence, ai_score, player_score, True, tt=tt,
+                                   stats=stats, cancel=cancel)
+
+
+class Ponderer:
+    """
+    Lieto no galvenā pavediena: start() cilvēka gājiena sākumā, cancel(), kad
+    cilvēks ir izdarījis gājienu, lookup() AI gājiena sākumā.
+    """
+
+    def __init__(self):
+        # (algo, GameState.key()) -> (move, SearchStats)
+        self.cache = {}
+        self.cancel_event = None
+
+    def start(self, sequence, ai_score, player_score, algo):
+        """
+        Sāk domāt stāvoklī, kurā gājiens ir cilvēkam. Iepriekšējo domāšanu atceļ.
+        """
+        self.cancel()
+        self.cache = {}
+        if algo not in PONDER_ALGOS or not sequence:
+            return
+        event = threading.Event()
+        self.cancel_event = event
+        threading.Thread(target=self._run, name="Ponder", daemon=True,
+                         args=(list(sequence), ai_score, player_score, algo,
+                               event, self.cache)).start()
+
+    def cancel(self):
+        """
+        Aptur domāšanu; negaida, kamēr pavediens beidzas (tas beigsies pie nākamā mezgla).
+        """
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.cancel_event = None
+
+    def lookup(self, sequence, ai_score, player_score, algo):
+        """
+        Iepriekš atrastais (move, SearchStats) AI gājienam šajā stāvoklī vai None.
+        """
+        return self.cache.get((algo, make_state(sequence, ai_score, player_score, True).key()))
+
+    def _run(self, sequence, ai_score, player_score, algo, cancel, cache):
+        # Katrai domāšanai sava tabula: atcelts pavediens var vēl darboties, kad sākas nākamais
+        tt = TranspositionTable() if algo == "Alpha-Beta" else None
+        state = make_state(sequence, ai_score, player_score, ai_turn=False)
+        for reply in likely_replies(state):
+            if cancel.is_set():
+                return
+            seq, ai, player = apply_sequence_move(sequence, ai_score, player_score, reply,
+                                                  ai_turn=False)
+            if not seq:
+                continue
+            stats = SearchStats()
+            start = time.perf_counter()
+            try:
+                move = search(algo, seq, ai, player, stats, cancel, tt)
+            except SearchTimeout:
+                return
+            if cancel.is_set():
+                # Iteratīvā padziļināšana pēc atcelšanas atgriež seklāku gājienu
+                return
+            stats.elapsed = time.perf_counter() - start
+            cache[(algo, make_state(seq, ai, player, True).key())] = (move, stats)
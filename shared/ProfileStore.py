@@ -0,0 +1,173 @@
+"""
+Spēlētāju profilu glabātuve: labākais sasniegtais līmenis, nospēlēto spēļu
+skaits un AI vidējais domāšanas laiks katram spēlētājam.
+
+Dati glabājas SQLite datubāzē WAL režīmā, tāpēc vairāki spēles procesi
+(piem., kioskā) var to lietot vienlaikus. Rakstīšana notiek fona pavedienā:
+record_game() tikai ieliek ierakstu rindā, un pavediens vienā transakcijā
+ieraksta visu, kas sakrājies FLUSH_INTERVAL sekunžu laikā, tāpēc saglabāšana
+neaptur zīmēšanas ciklu.
+
+Ieraksts datubāzē ir pieaugums (spēļu skaits + 1, domāšanas laiks + t,
+labākais līmenis = max), tāpēc vienlaicīgu procesu ieraksti nepazūd.
+Šajā procesā profilu lasa no datubāzes vienreiz un pēc tam uztur atmiņā.
+"""
+
+import atexit
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "profiles.db")
+
+# Cik ilgi (sekundēs) rakstītājs krāj ierakstus vienai transakcijai
+FLUSH_INTERVAL = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    name          TEXT PRIMARY KEY,
+    best_level    INTEGER NOT NULL DEFAULT 0,
+    games_played  INTEGER NOT NULL DEFAULT 0,
+    ai_moves      INTEGER NOT NULL DEFAULT 0,
+    ai_think_time REAL    NOT NULL DEFAULT 0
+)
+"""
+
+UPSERT = """
+INSERT INTO profiles (name, best_level, games_played, ai_moves, ai_think_time)
+VALUES (?, ?, 1, ?, ?)
+ON CONFLICT(name) DO UPDATE SET
+    best_level    = max(best_level, excluded.best_level),
+    games_played  = games_played + 1,
+    ai_moves      = ai_moves + excluded.ai_moves,
+    ai_think_time = ai_think_time + excluded.ai_think_time
+"""
+
+
+def connect(path):
+    connection = sqlite3.connect(path, timeout=5.0)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # WAL režīmā NORMAL ir drošs pret bojājumiem un nesinhronizē katru transakciju
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+class Profile:
+    def __init__(self, name, best_level=0, games_played=0, ai_moves=0, ai_think_time=0.0):
+        self.name = name
+        self.best_level = best_level
+        self.games_played = games_played
+        self.ai_moves = ai_moves
+        self.ai_think_time = ai_think_time
+
+    @property
+    def avg_think_time(self):
+        """
+        AI vidējais laiks vienam gājienam (sekundēs).
+        """
+        return self.ai_think_time / self.ai_moves if self.ai_moves else 0.0
+
+    def __repr__(self):
+        return (f"Profile({self.name!r}, best_level={self.best_level}, "
+                f"games_played={self.games_played}, avg_think_time={self.avg_think_time:.3f})")
+
+
+class ProfileStore:
+    """
+    Lieto no viena (galvenā) pavediena; rakstīšanu veic paša fona pavediens.
+    close() ieraksta visu, kas vēl rindā; to izsauc arī programmas beigās (atexit).
+    """
+
+    def __init__(self, path=DEFAULT_PATH, flush_interval=FLUSH_INTERVAL):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.profiles = {}
+        self.connection = connect(path)
+        with self.connection:
+            self.connection.execute(SCHEMA)
+
+        self.pending = queue.Queue()
+        self.writer = threading.Thread(target=self._write_loop, name="ProfileStore writer",
+                                       daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def profile(self, name):
+        """
+        Spēlētāja profils (jauns, ja tāda vēl nav).
+        """
+        profile = self.profiles.get(name)
+        if profile is None:
+            row = self.connection.execute(
+                "SELECT best_level, games_played, ai_moves, ai_think_time "
+                "FROM profiles WHERE name = ?", (name,)).fetchone()
+            profile = Profile(name, *row) if row else Profile(name)
+            self.profiles[name] = profile
+        return profile
+
+    def record_game(self, name, won_level=0, ai_moves=0, ai_think_time=0.0):
+        """
+        Pieskaita nospēlētu spēli. won_level - līmenis, kurā spēlētājs uzvarēja
+        (0, ja neuzvarēja); ai_moves un ai_think_time - AI gājieni un to kopējais laiks.
+        Atgriež atjaunināto profilu; datubāzē to ieraksta fona pavediens.
+        """
+        profile = self.profile(name)
+        profile.best_level = max(profile.best_level, won_level)
+        profile.games_played += 1
+        profile.ai_moves += ai_moves
+        profile.ai_think_time += ai_think_time
+        self.pending.put((name, won_level, ai_moves, ai_think_time))
+        return profile
+
+    def _write_loop(self):
+        connection = connect(self.path)
+        stop = False
+        while not stop:
+            item = self.pending.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                timeout = deadline - time.monotonic()
+                try:
+                    item = self.pending.get(timeout=timeout) if timeout > 0 else self.pending.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            try:
+                with connection:
+                    connection.executemany(UPSERT, batch)
+            except sqlite3.Error as e:
+                print(f"ProfileStore: could not save {len(batch)} games: {e}", file=sys.stderr)
+        connection.close()
+
+    def close(self):
+        """
+        Ieraksta rindā palikušās spēles un aizver datubāzi; atkārtoti neko nedara.
+        """
+        if self.writer is None:
+            return
+        self.pending.put(None)
+        self.writer.join()
+        self.writer = None
+        self.connection.close()
+        atexit.unregister(self.close)
+
+
+def open_default(path=DEFAULT_PATH):
+    """
+    Atver glabātuvi vai atgriež None, ja datubāzi nevar atvērt (piem., mape
+    tikai lasāma) - spēle tad darbojas bez saglabāšanas.
+    """
+    try:
+        return ProfileStore(path)
+    except (OSError, sqlite3.Error) as e:
+        print(f"Profiles are not saved: {e}", file=sys.stderr)
+        return None
@@ -0,0 +1,113 @@
+"""
+Meklēšanas statistika: apmeklēto mezglu un nogriešanu skaits katrā dziļumā (ply).
+Sakne ir ply 0, tās bērni - ply 1 utt.
+
+Pēc gājiena tā ir arī meklēšanas atskaite: transpozīciju tabulas trāpījumi,
+sasniegtais dziļums, efektīvais zarošanās koeficients, laiks un avots
+(kurš dzinējs vai tabula gājienu atrada).
+"""
+
+
+class SearchStats:
+    def __init__(self):
+        self.nodes = []
+        self.cutoffs = []
+        self.tt_probes = 0
+        self.tt_hits = 0
+        # Pilnībā pabeigtais meklēšanas dziļums (iteratīvajā padziļināšanā - pēdējais)
+        self.depth = 0
+        self.elapsed = 0.0
+        # "alphabeta", "pvs", "none", "solve", "tablebase", "book", "mcts", "random" ...
+        self.source = None
+
+    def _grow(self, ply):
+        while len(self.nodes) <= ply:
+            self.nodes.append(0)
+            self.cutoffs.append(0)
+
+    def record_node(self, ply):
+        if ply >= len(self.nodes):
+            self._grow(ply)
+        self.nodes[ply] += 1
+
+    def record_cutoff(self, ply):
+        if ply >= len(self.cutoffs):
+            self._grow(ply)
+        self.cutoffs[ply] += 1
+
+    @property
+    def total_nodes(self):
+        return sum(self.nodes)
+
+    @property
+    def total_cutoffs(self):
+        return sum(self.cutoffs)
+
+    @property
+    def max_ply(self):
+        """
+        Dziļākais apmeklētais ply.
+        """
+        return max(len(self.nodes) - 1, 0)
+
+    @property
+    def branching_factor(self):
+        """
+        Efektīvais zarošanās koeficients: b, kuram b ** depth = mezglu skaits.
+        """
+        if self.depth <= 0 or self.total_nodes <= 1:
+            return 0.0
+        return self.total_nodes ** (1.0 / self.depth)
+
+    def merge(self, other):
+        """
+        Pieskaita citas meklēšanas (piem., cita procesa) skaitītājus.
+        """
+        self._grow(len(other.nodes) - 1)
+        for ply, count in enumerate(other.nodes):
+            self.nodes[ply] += count
+        for ply, count in enumerate(other.cutoffs):
+            self.cutoffs[ply] += count
+        self.tt_probes += other.tt_probes
+        self.tt_hits += other.tt_hits
+
+    def reset(self):
+        self.nodes = []
+        self.cutoffs = []
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.depth = 0
+        self.elapsed = 0.0
+        self.source = None
+
+    def as_dict(self):
+        return {
+            "source": self.source,
+            "depth": self.depth,
+            "max_ply": self.max_ply,
+            "elapsed": self.elapsed,
+            "nodes": self.total_nodes,
+            "cutoffs": self.total_cutoffs,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "branching_factor": self.branching_factor,
+            "nodes_per_ply": list(self.nodes),
+            "cutoffs_per_ply": list(self.cutoffs),
+        }
+
+    def summary_lines(self):
+        """
+        Īsa atskaite pa rindām (konsolei vai GUI atkļūdošanas logam).
+        """
+        return [
+            f"{self.source or '?'}: depth={self.depth} max_ply={self.max_ply} "
+            f"time={1000 * self.elapsed:.1f} ms",
+            f"nodes={self.total_nodes} cutoffs={self.total_cutoffs} "
+            f"tt={self.tt_hits}/{self.tt_probes} ebf={self.branching_factor:.2f}",
+        ]
+
+    def __str__(self):
+        lines = self.summary_lines()
+        for ply, (nodes, cutoffs) in enumerate(zip(self.nodes, self.cutoffs)):
+            lines.append(f"  ply {ply}: nodes={nodes} cutoffs={cutoffs}")
+        return "\n".join(lines)
@@ -0,0 +1,281 @@
+"""
+Galotņu tabula (tablebase): precīzas vērtības un labākie gājieni visiem
+stāvokļiem, kas sasniedzami no virknes ar ne vairāk kā MAX_NUMBERS skaitļiem.
+
+Tabulu ģenerē bezsaistē ar retrogrādo analīzi: katrs gājiens samazina
+GameState.max_plies() vismaz par 1, tāpēc, apstrādājot stāvokļus pēc
+max_plies() augošā secībā, visu bērnu vērtības jau ir zināmas.
+
+Stāvokli glabā pēc GameState.canonical_key(): (c1, c2, c3, c4, mover, opponent),
+kur punkti ir ierobežoti ar c4. Ar punktu starpību vien nepietiek - split4
+atņem pretiniekam punktu tikai tad, ja tam ir vismaz 1 punkts, tāpēc
+absolūtie punkti (līdz c4) ir daļa no atslēgas.
+
+Faila formāts: galvene HEADER (MAGIC, FORMAT_VERSION, max_numbers, ierakstu
+skaits, CRC32), tad int16 ieraksti (little-endian) ar fiksētu soli.
+Ieraksti sakārtoti pēc (c4, c3, c2, c1, mover, opponent), tāpēc ieraksta
+pozīciju aprēķina ar aritmētiku (Tablebase.index()), bez indeksa vārdnīcas.
+Ieraksts = gain * 8 + gājiena kods (indekss MOVES, terminālam stāvoklim NO_MOVE).
+
+Failu atver ar mmap: startēšana nelasa visu tabulu, un vairāki procesi
+izmanto tās pašas atmiņas lapas.
+
+Ģenerēšana: python Tablebase.py [--max-numbers N] [--output PATH]
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+MAX_NUMBERS = 20
+
+MAGIC = b"GTBL"
+# Jāpalielina, ja mainās faila izkārtojums vai spēles noteikumi - vecās tabulas tad tiek noraidītas
+FORMAT_VERSION = 2
+# magic, version, max_numbers, ierakstu skaits, CRC32 no ierakstiem
+HEADER = struct.Struct("<4sHHII")
+ENTRY = struct.Struct("<h")
+
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tablebase.bin")
+
+# Gājiena kods -> kanoniskais gājiens (tāda pati secība kā GameState.moves())
+MOVES = (("take", 1), ("take", 2), ("take", 3), ("take", 4), ("split2", 2), ("split4", 4))
+NO_MOVE = 7
+
+
+def iter_bases(max_numbers=MAX_NUMBERS):
+    """
+    Visi sasniedzamie (c1, c2, c3, c4) faila secībā.
+    Vieninieku pāri var rasties no 2, divnieku pāri - no 4, tāpēc stāvoklis ir
+    sasniedzams, ja c3 + c4 + ceil((c2 + ceil(c1 / 2)) / 2) <= max_numbers.
+    Gājieni šo lielumu nepalielina, tāpēc bērni vienmēr ir tabulā.
+    """
+    for c4 in range(max_numbers + 1):
+        for c3 in range(max_numbers + 1 - c4):
+            rest = max_numbers - c3 - c4
+            for c2 in range(2 * rest + 1):
+                for c1 in range(2 * (2 * rest - c2) + 1):
+                    yield c1, c2, c3, c4
+
+
+def block_starts(max_numbers=MAX_NUMBERS):
+    """
+    Atgriež (starts, size): starts[c4 * (max_numbers + 1) + c3] ir (c4, c3) bloka
+    pirmā ieraksta indekss, size - ierakstu skaits. Blokā ir (2 * rest + 1) ** 2
+    bāzes stāvokļi (rest = max_numbers - c3 - c4), katrā (c4 + 1) ** 2 ieraksti.
+    """
+    starts = [0] * (max_numbers + 1) ** 2
+    size = 0
+    for c4 in range(max_numbers + 1):
+        for c3 in range(max_numbers + 1 - c4):
+            rest = max_numbers - c3 - c4
+            starts[c4 * (max_numbers + 1) + c3] = size
+            size += (c4 + 1) ** 2 * (2 * rest + 1) ** 2
+    return starts, size
+
+
+def _children(base):
+    """
+    Bāzes stāvokļa gājieni kā (kods, bērna bāzes stāvoklis).
+    """
+    c1, c2, c3, c4 = base
+    counts = (0, c1, c2, c3, c4)
+    children = []
+    for value in (1, 2, 3, 4):
+        if counts[value]:
+            child = list(base)
+            child[value - 1] -= 1
+            children.append((value - 1, tuple(child)))
+    if c2:
+        children.append((4, (c1 + 2, c2 - 1, c3, c4)))
+    if c4:
+        children.append((5, (c1, c2 + 2, c3, c4 - 1)))
+    return children
+
+
+class Tablebase:
+    """
+    entries - int16 ierakstu secība (array vai memoryview pār mmap);
+    mapping - atvērtais mmap vai None, ja tabula ir atmiņā.
+    """
+
+    def __init__(self, entries, max_numbers, mapping=None):
+        self.entries = entries
+        self.max_numbers = max_numbers
+        self.mapping = mapping
+        self.starts, size = block_starts(max_numbers)
+        if len(entries) != size:
+            raise ValueError(f"expected {size} entries for max_numbers={max_numbers}")
+
+    def __len__(self):
+        return len(self.entries)
+
+    def index(self, c1, c2, c3, c4, mover, opponent):
+        """
+        Ieraksta indekss vai -1, ja stāvoklis nav sasniedzams no max_numbers skaitļiem.
+        """
+        n = self.max_numbers
+        rest = n - c3 - c4
+        if rest < 0 or c2 > 2 * rest or c1 > 2 * (2 * rest - c2):
+            return -1
+        # (c2, c1) rinda c2 satur 4 * rest - 2 * c2 + 1 stāvokļus
+        base = c2 * (4 * rest + 1) - c2 * (c2 - 1) + c1
+        width = c4 + 1
+        return self.starts[c4 * (n + 1) + c3] + (base * width + mover) * width + opponent
+
+    def probe(self, state):
+        """
+        Atgriež (gain, move) tāpat kā Engine.solve() vai None, ja stāvokļa tabulā nav.
+        """
+        position = self.index(*state.canonical_key())
+        if position < 0:
+            return None
+        entry = self.entries[position]
+        code = entry & 7
+        return entry >> 3, (MOVES[code] if code != NO_MOVE else None)
+
+    def save(self, path=DEFAULT_PATH):
+        entries = array("h", self.entries)
+        if sys.byteorder != "little":
+            entries.byteswap()
+        data = entries.tobytes()
+        with open(path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, self.max_numbers,
+                                len(entries), zlib.crc32(data)))
+            f.write(data)
+
+    @classmethod
+    def load(cls, path=DEFAULT_PATH, verify=True):
+        """
+        Atver tabulu ar mmap (tikai lasīšanai). ValueError, ja fails nav šīs
+        versijas tabula, ir nepilnīgs vai (ar verify) nesakrīt kontrolsumma.
+        """
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = None
+        try:
+            if len(mapping) < HEADER.size:
+                raise ValueError(f"{path}: file too short for a tablebase header")
+            magic, version, max_numbers, count, checksum = HEADER.unpack_from(mapping)
+            if magic != MAGIC:
+                raise ValueError(f"{path}: not a tablebase file")
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path}: tablebase version {version}, expected {FORMAT_VERSION}")
+            if count != block_starts(max_numbers)[1]:
+                raise ValueError(f"{path}: wrong entry count for max_numbers={max_numbers}")
+            if len(mapping) != HEADER.size + ENTRY.size * count:
+                raise ValueError(f"{path}: truncated tablebase")
+            data = memoryview(mapping)[HEADER.size:]
+            if verify and zlib.crc32(data) != checksum:
+                raise ValueError(f"{path}: tablebase checksum mismatch")
+            if sys.byteorder == "little":
+                entries = data.cast("h")
+            else:
+                entries = array("h", data.tobytes())
+                entries.byteswap()
+            return cls(entries, max_numbers, mapping)
+        except ValueError:
+            if data is not None:
+                data.release()
+            mapping.close()
+            raise
+
+    def close(self):
+        if self.mapping is not None:
+            if isinstance(self.entries, memoryview):
+                self.entries.release()
+            self.mapping.close()
+            self.mapping = None
+
+
+def generate(max_numbers=MAX_NUMBERS):
+    """
+    Retrogrādā analīze: aizpilda tabulu visiem stāvokļiem max_plies() augošā secībā.
+    """
+    _, size = block_starts(max_numbers)
+    tablebase = Tablebase(array("h", bytes(2 * size)), max_numbers)
+    table = tablebase.entries
+    index = tablebase.index
+
+    def potential(base):
+        c1, c2, c3, c4 = base
+        return c1 + 3 * c2 + c3 + 7 * c4
+
+    for base in sorted(iter_bases(max_numbers), key=potential):
+        c4 = base[3]
+        width = c4 + 1
+        offset = index(*base, 0, 0)
+        children = [(code, index(*child, 0, 0), child[3]) for code, child in _children(base)]
+        if not children:
+            table[offset] = NO_MOVE
+            continue
+
+        for mover in range(width):
+            for opponent in range(width):
+                best_gain = None
+                best_code = NO_MOVE
+                for code, child_offset, child_c4 in children:
+                    # Bērnā gājiens ir pretiniekam: (mover, opponent) samainās vietām
+                    if code < 4:
+                        value = code + 1
+                        lead = value
+                        child_mover = min(opponent, child_c4)
+                        child_opponent = min(mover + value, child_c4)
+                    elif code == 4:
+                        # split2: pretiniekam +1
+                        lead = -1
+                        child_mover = min(opponent + 1, child_c4)
+                        child_opponent = mover
+                    else:
+                        # split4: pretiniekam -1, ja tam ir ko atņemt
+                        lead = 1 if opponent else 0
+                        child_mover = min(max(0, opponent - 1), child_c4)
+                        child_opponent = min(mover, child_c4)
+                    entry = table[child_offset + child_mover * (child_c4 + 1) + child_opponent]
+                    gain = lead - (entry >> 3)
+                    if best_gain is None or gain > best_gain:
+                        best_gain = gain
+                        best_code = code
+                table[offset + mover * width + opponent] = best_gain * 8 + best_code
+
+    return tablebase
+
+
+def load_default(path=DEFAULT_PATH):
+    """
+    Atver ģenerēto tabulu, ja tā ir; citādi None (dzinēji tad meklē paši).
+    Bojātu vai novecojušu failu ignorē, lai spēle tik un tā startētu.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        return Tablebase.load(path)
+    except (OSError, ValueError):
+        return None
+
+
+# Kopīgā tabula abiem dzinējiem (None, ja tablebase.bin nav ģenerēts)
+TABLEBASE = load_default()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the endgame tablebase.")
+    parser.add_argument("--max-numbers", type=int, default=MAX_NUMBERS,
+                        help="longest starting sequence covered by the table")
+    parser.add_argument("--output", default=DEFAULT_PATH, help="output file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    tablebase = generate(args.max_numbers)
+    tablebase.save(args.output)
+    print(f"{len(tablebase)} positions written to {args.output} "
+          f"in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Transpozīciju tabula Alpha-Beta meklēšanai.
+
+Atslēga ir kanoniskais stāvoklis no GameState (tas ir jaucams kortežs),
+vērtība ir (value, depth, flag, best_move). Tabulas izmērs ir ierobežots,
+un, kad tā ir pilna, ieraksts tiek izmests pēc izvēlētās politikas:
+- "depth": no vecākajiem ierakstiem izmet seklāko (depth-preferred);
+- "lru":   izmet ilgāk neizmantoto ierakstu.
+"""
+
+from collections import OrderedDict
+from itertools import islice
+
+# Vērtības tips (bound type)
+EXACT = 0   # precīza vērtība
+LOWER = 1   # vērtība >= value (notika beta nogriešana)
+UPPER = 2   # vērtība <= value (neviens gājiens nepārspēja alpha)
+
+# Ieraksta lauku indeksi
+VALUE, DEPTH, FLAG, BEST_MOVE = range(4)
+
+POLICIES = ("depth", "lru")
+
+
+class TranspositionTable:
+    def __init__(self, max_size=100000, policy="depth", scan=8):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replacement policy: {policy!r}")
+        self.max_size = max_size
+        self.policy = policy
+        # Cik vecākos ierakstus apskata "depth" politika, meklējot seklāko
+        self.scan = scan
+        self.table = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.table)
+
+    def lookup(self, key):
+        """
+        Atgriež ierakstu (value, depth, flag, best_move) vai None.
+        """
+        entry = self.table.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.policy == "lru":
+            self.table.move_to_end(key)
+        return entry
+
+    def store(self, key, value, depth, flag, best_move):
+        """
+        Saglabā meklēšanas rezultātu. Ar "depth" politiku seklāks rezultāts
+        nepārraksta jau esošu dziļāku ierakstu par to pašu stāvokli.
+        """
+        old = self.table.get(key)
+        if old is not None:
+            if self.policy == "depth" and old[DEPTH] > depth:
+                return
+            if self.policy == "lru":
+                self.table.move_to_end(key)
+        elif len(self.table) >= self.max_size:
+            self._evict()
+
+        self.table[key] = (value, depth, flag, best_move)
+        self.stores += 1
+
+    def _evict(self):
+        if self.policy == "lru":
+            self.table.popitem(last=False)
+        else:
+            oldest = islice(self.table.items(), self.scan)
+            victim = min(oldest, key=lambda item: item[1][DEPTH])[0]
+            del self.table[victim]
+        self.evictions += 1
+
+    def clear(self):
+        """
+        Iztukšo tabulu un nonullē skaitītājus.
+        """
+        self.table.clear()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    def stats(self):
+        """
+        Atgriež skaitītājus vārdnīcas formā.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "size": len(self.table),
+            "max_size": self.max_size,
+            "policy": self.policy,
+        }